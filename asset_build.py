@@ -0,0 +1,183 @@
+import json
+import os
+import re
+
+from PIL import Image, features
+
+from assets import fingerprint
+
+
+# Сборка статики (flask build-assets): находит файлы, на которые реально ссылаются шаблоны,
+# оставляет только используемые начертания Inter и урезает их до латиницы и кириллицы,
+# а картинки перекодирует в WebP/AVIF нескольких размеров для srcset.
+# Результат кладётся в static/build, список замен - в static/build/manifest.json.
+
+BUILD_DIR = 'build'
+MANIFEST = 'manifest.json'
+
+# Латиница с дополнением Latin-1, кириллица, типографские знаки, №, ₽ и €
+UNICODE_RANGES = [(0x0000, 0x00FF), (0x0400, 0x04FF), (0x2000, 0x206F), (0x20AC, 0x20AC), (0x20BD, 0x20BD),
+                  (0x2116, 0x2116)]
+IMAGE_WIDTHS = (96, 192, 384, 768)
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg'}
+
+TEMPLATE_STATIC_RE = re.compile(r"url_for\s*\(\s*'static'\s*,\s*filename\s*=\s*'([^']+)'")
+TEMPLATE_PICTURE_RE = re.compile(r"picture\s*\(\s*'([^']+)'")
+CSS_URL_RE = re.compile(r"url\(\s*['\"]?([^'\")?#]+)")
+FONT_FACE_RE = re.compile(r'@font-face\s*{([^}]*)}')
+FONT_WEIGHTS = {'normal': 400, 'bold': 700}
+BOLD_TAGS_RE = re.compile(r'<(h[1-6]|b|strong|th)[\s>]')
+ITALIC_TAGS_RE = re.compile(r'<(i|em)[\s>]')
+
+
+def build(static_dir, templates_dir):
+    out_dir = os.path.join(static_dir, BUILD_DIR)
+    templates = _read_templates(templates_dir)
+    referenced = referenced_assets(templates, static_dir)
+    stylesheets = [name for name in referenced if name.endswith('.css')]
+    weights, italic = used_font_styles(templates, [os.path.join(static_dir, name) for name in stylesheets])
+
+    manifest = {'files': {}, 'images': {}}
+    report = {'fonts_kept': [], 'fonts_dropped': [], 'images': [], 'unused': []}
+    for name in stylesheets:
+        css_path = os.path.join(static_dir, name)
+        with open(css_path, encoding='utf-8') as f:
+            css = f.read()
+        if '@font-face' not in css:
+            continue
+        kept, dropped = build_font_stylesheet(css_path, css, os.path.join(out_dir, name), weights, italic)
+        manifest['files'][name] = f'{BUILD_DIR}/{name}'
+        report['fonts_kept'] += kept
+        report['fonts_dropped'] += dropped
+
+    for name in sorted(referenced):
+        if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS:
+            manifest['images'][name] = build_image(static_dir, name, out_dir)
+            report['images'].append(name)
+
+    # Картинки, на которые никто не ссылается, только перечисляем: удалять их - решение человека
+    image_dir = os.path.join(static_dir, 'image')
+    if os.path.isdir(image_dir):
+        report['unused'] = sorted(
+            f'image/{name}' for name in os.listdir(image_dir)
+            if os.path.splitext(name)[1].lower() in IMAGE_EXTENSIONS and f'image/{name}' not in referenced
+        )
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, MANIFEST), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    return report
+
+
+def _read_templates(templates_dir):
+    texts = []
+    for directory, _, files in os.walk(templates_dir):
+        for name in sorted(files):
+            if name.endswith('.html'):
+                with open(os.path.join(directory, name), encoding='utf-8') as f:
+                    # Закомментированная разметка браузером не загружается
+                    texts.append(re.sub(r'<!--.*?-->', '', f.read(), flags=re.S))
+    return texts
+
+
+def referenced_assets(templates, static_dir):
+    # Файлы из url_for('static', ...) и picture(...) в шаблонах, плюс url(...) внутри подключённых CSS
+    referenced = set()
+    for text in templates:
+        referenced.update(TEMPLATE_STATIC_RE.findall(text))
+        referenced.update(TEMPLATE_PICTURE_RE.findall(text))
+    for name in [name for name in referenced if name.endswith('.css')]:
+        path = os.path.join(static_dir, name)
+        if not os.path.isfile(path):
+            continue
+        with open(path, encoding='utf-8') as f:
+            for url in CSS_URL_RE.findall(f.read()):
+                target = os.path.normpath(os.path.join(os.path.dirname(name), url)).replace(os.sep, '/')
+                if os.path.isfile(os.path.join(static_dir, target)):
+                    referenced.add(target)
+    return {name for name in referenced if os.path.isfile(os.path.join(static_dir, name))}
+
+
+def used_font_styles(templates, css_paths):
+    # Какие насыщенности и есть ли курсив: из font-weight/font-style в CSS (кроме @font-face)
+    # и из тегов, которые браузер по умолчанию делает жирными или курсивными
+    weights, italic = {400}, False
+    for path in css_paths:
+        with open(path, encoding='utf-8') as f:
+            css = FONT_FACE_RE.sub('', f.read())
+        for value in re.findall(r'font-weight\s*:\s*([\w-]+)', css):
+            weights.add(FONT_WEIGHTS.get(value, int(value) if value.isdigit() else 400))
+        italic = italic or bool(re.search(r'font-style\s*:\s*(italic|oblique)', css))
+    for text in templates:
+        if BOLD_TAGS_RE.search(text):
+            weights.add(700)
+        italic = italic or bool(ITALIC_TAGS_RE.search(text))
+    return weights, italic
+
+
+def build_font_stylesheet(css_path, css, out_path, weights, italic):
+    from fontTools import subset  # Нужен только для сборки (fonttools и brotli есть в requirements.txt)
+
+    os.makedirs(os.path.dirname(out_path), exist_ok=True)
+    faces, kept, dropped = [], [], []
+    for body in FONT_FACE_RE.findall(css):
+        family = re.search(r'font-family\s*:\s*([^;]+);', body).group(1).strip()
+        weight = re.search(r'font-weight\s*:\s*([\w-]+)', body).group(1)
+        weight = FONT_WEIGHTS.get(weight, int(weight) if weight.isdigit() else 400)
+        style = re.search(r'font-style\s*:\s*(\w+)', body).group(1)
+        font = re.search(r"url\(\s*['\"]?([^'\")]+\.woff2)", body).group(1)
+        if weight not in weights or (style != 'normal' and not italic):
+            dropped.append(font)
+            continue
+
+        out_font = os.path.join(os.path.dirname(out_path), font)
+        options = subset.Options()
+        options.flavor = 'woff2'
+        options.layout_features = ['*']
+        source = subset.load_font(os.path.join(os.path.dirname(css_path), font), options)
+        subsetter = subset.Subsetter(options)
+        subsetter.populate(unicodes=[code for start, end in UNICODE_RANGES for code in range(start, end + 1)])
+        subsetter.subset(source)
+        subset.save_font(source, out_font, options)
+        kept.append(font)
+        faces.append(
+            '@font-face {\n'
+            f'    font-family: {family};\n'
+            f"    src: url('{font}?v={fingerprint(out_font)}') format('woff2');\n"
+            f'    font-weight: {weight};\n'
+            f'    font-style: {style};\n'
+            '    font-display: swap;\n'
+            f'    unicode-range: {", ".join(_unicode_range(start, end) for start, end in UNICODE_RANGES)};\n'
+            '}\n'
+        )
+    with open(out_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(faces))
+    return kept, dropped
+
+
+def _unicode_range(start, end):
+    return f'U+{start:04X}' if start == end else f'U+{start:04X}-{end:04X}'
+
+
+def build_image(static_dir, name, out_dir):
+    # Варианты для srcset: {mimetype: [[путь от static, ширина], ...]}; ширины не больше исходной
+    formats = [('image/avif', 'AVIF', '.avif')] if features.check('avif') else []
+    formats.append(('image/webp', 'WEBP', '.webp'))
+    directory, filename = os.path.split(os.path.splitext(name)[0])
+    stem = os.path.join(directory, re.sub(r'[^\w-]+', '-', filename)).replace(os.sep, '/')
+
+    variants = {}
+    with Image.open(os.path.join(static_dir, name)) as img:
+        img.load()
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA')
+        widths = [width for width in IMAGE_WIDTHS if width < img.width] + [img.width]
+        for mimetype, image_format, extension in formats:
+            variants[mimetype] = []
+            for width in widths:
+                resized = img.resize((width, round(img.height * width / img.width)), Image.Resampling.LANCZOS)
+                target = f'{stem}-{width}{extension}'
+                os.makedirs(os.path.dirname(os.path.join(out_dir, target)), exist_ok=True)
+                resized.save(os.path.join(out_dir, target), image_format, quality=80)
+                variants[mimetype].append([f'{BUILD_DIR}/{target}', width])
+    return variants
@@ -0,0 +1,83 @@
+import gzip
+import hashlib
+import json
+import os
+
+
+# Статические файлы: отпечаток содержимого для адресов вида /static/css/style.css?v=<хеш>
+# и заранее сжатые варианты (.br, .gz), которые отдаются вместо исходника, если клиент их принимает.
+
+COMPRESSIBLE_EXTENSIONS = {'.css', '.js', '.svg', '.html', '.txt', '.json', '.eot', '.ttf'}
+ENCODINGS = [('br', '.br'), ('gzip', '.gz')]  # В порядке предпочтения
+
+_fingerprints = {}
+_manifest = {}
+
+
+def fingerprint(path):
+    # Хеш содержимого; пересчитывается, только если файл изменился
+    stat = os.stat(path)
+    cached = _fingerprints.get(path)
+    if cached and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(64 * 1024), b''):
+            digest.update(chunk)
+    value = digest.hexdigest()[:12]
+    _fingerprints[path] = ((stat.st_mtime_ns, stat.st_size), value)
+    return value
+
+
+def manifest(static_dir):
+    # Замены из flask build-assets (static/build/manifest.json); пустой, если сборки не было
+    path = os.path.join(static_dir, 'build', 'manifest.json')
+    try:
+        mtime = os.path.getmtime(path)
+    except FileNotFoundError:
+        return {'files': {}, 'images': {}}
+    if _manifest.get('mtime') != mtime:
+        with open(path, encoding='utf-8') as f:
+            _manifest.update(mtime=mtime, data=json.load(f))
+    return _manifest['data']
+
+
+def is_compressible(path):
+    return os.path.splitext(path)[1].lower() in COMPRESSIBLE_EXTENSIONS
+
+
+def precompressed(path, accept_encoding):
+    # (кодировка, путь к сжатому файлу) или None; устаревшие варианты (старше исходника) не используются
+    accepted = {part.split(';')[0].strip() for part in accept_encoding.lower().split(',')}
+    for encoding, suffix in ENCODINGS:
+        variant = path + suffix
+        if encoding in accepted and os.path.exists(variant) and os.path.getmtime(variant) >= os.path.getmtime(path):
+            return encoding, variant
+    return None
+
+
+def compress_tree(root):
+    # Создаёт .gz и, если установлен пакет brotli, .br рядом с каждым сжимаемым файлом.
+    # Вариант сохраняется, только если он меньше исходника. Возвращает список созданных файлов
+    try:
+        import brotli
+    except ImportError:
+        brotli = None
+
+    created = []
+    for directory, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(directory, name)
+            if not is_compressible(path):
+                continue
+            with open(path, 'rb') as f:
+                data = f.read()
+            variants = [('.gz', gzip.compress(data, compresslevel=9, mtime=0))]
+            if brotli:
+                variants.append(('.br', brotli.compress(data, quality=11)))
+            for suffix, compressed in variants:
+                if len(compressed) < len(data):
+                    with open(path + suffix, 'wb') as f:
+                        f.write(compressed)
+                    created.append(path + suffix)
+    return created
@@ -0,0 +1,3 @@
+# Нагрузочный тест мастера регистрации: python -m benchmark --help
+# Каждый виртуальный пользователь проходит всю анкету от /create_user до /registration_end;
+# замеряются задержки по маршрутам, пропускная способность и ошибки блокировки базы.
@@ -0,0 +1,73 @@
+import argparse
+import os
+import sys
+import tempfile
+
+from benchmark.clients import HttpClient, TestClient
+from benchmark.runner import previous_run, print_report, run, save
+from benchmark.server import ROOT, local_server, migrate_database
+from benchmark.wizard import make_photo
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m benchmark',
+        description='Нагрузочный тест мастера регистрации: от /create_user до /registration_end.'
+    )
+    parser.add_argument('--target', choices=['test', 'gunicorn', 'waitress', 'url'], default='test',
+                        help='test - тестовый клиент Flask в этом процессе; gunicorn/waitress - локальный сервер; '
+                             'url - уже запущенный сервер по --url')
+    parser.add_argument('--url', help='Адрес сервера для --target url')
+    parser.add_argument('--registrations', type=int, default=100, help='Сколько регистраций пройти')
+    parser.add_argument('--concurrency', type=int, default=8, help='Сколько регистраций идут одновременно')
+    parser.add_argument('--workers', type=int, default=2, help='Процессы gunicorn или потоки waitress')
+    parser.add_argument('--photo-size', default='1600x1200', help='Размер загружаемого фото, ШxВ')
+    parser.add_argument('--database-url', help='База для теста (по умолчанию - новая SQLite во временной папке)')
+    parser.add_argument('--results', default=os.path.join(ROOT, 'instance', 'benchmark.jsonl'),
+                        help='Файл, куда дописываются результаты')
+    parser.add_argument('--label', default='', help='Пометка запуска (сравниваются только запуски с той же пометкой)')
+    args = parser.parse_args()
+
+    width, height = (int(side) for side in args.photo_size.split('x'))
+    photo = make_photo(width, height)
+    config = {
+        'target': args.target, 'registrations': args.registrations, 'concurrency': args.concurrency,
+        'workers': args.workers if args.target in ('gunicorn', 'waitress') else None,
+        'photo_size': args.photo_size, 'database': 'sqlite' if not args.database_url else args.database_url.split(':')[0],
+        'label': args.label,
+    }
+
+    # Отдельная база и хранилище фото, чтобы не трогать рабочие данные
+    workdir = tempfile.mkdtemp(prefix='bot_ef_benchmark_')
+    env = {
+        'DATABASE_URL': args.database_url or f"sqlite:///{os.path.join(workdir, 'benchmark.db')}",
+        'PHOTO_STORAGE_PATH': os.path.join(workdir, 'photos'),
+        'UPLOAD_CHUNKS_PATH': os.path.join(workdir, 'uploads'),
+        'SECRET_KEY': 'benchmark',
+        'RATE_LIMIT_ENABLED': '0',  # Все регистрации идут с одного адреса
+    }
+
+    if args.target == 'test':
+        os.environ.update(env)
+        sys.path.insert(0, ROOT)
+        migrate_database(env)
+        from app import create_app
+        app = create_app()
+        summary = run(lambda: TestClient(app), args.registrations, args.concurrency, photo)
+    elif args.target == 'url':
+        if not args.url:
+            parser.error('для --target url нужен --url')
+        summary = run(lambda: HttpClient(args.url), args.registrations, args.concurrency, photo)
+    else:
+        migrate_database(env)
+        with local_server(args.target, args.workers, env) as url:
+            summary = run(lambda: HttpClient(url), args.registrations, args.concurrency, photo)
+
+    previous = previous_run(args.results, config)
+    save(args.results, config, summary)
+    print_report(summary, previous)
+    print(f"Результаты сохранены в {args.results}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+from http.cookiejar import CookieJar
+from io import BytesIO
+from urllib.error import HTTPError
+from urllib.parse import urlencode
+import secrets
+import urllib.request
+
+
+# Клиенты с одинаковым интерфейсом: request(метод, путь, поля формы, файл) -> (статус, тело).
+# Редиректы не выполняются, чтобы каждый запрос мастера замерялся отдельно.
+
+class TestClient:
+    def __init__(self, app):
+        self.client = app.test_client()
+
+    def request(self, method, path, data=None, upload=None):
+        if upload:
+            field, filename, content = upload
+            data = {**(data or {}), field: (BytesIO(content), filename)}
+            response = self.client.open(path, method=method, data=data, content_type='multipart/form-data')
+        else:
+            response = self.client.open(path, method=method, data=data)
+        return response.status_code, response.get_data()
+
+
+class HttpClient:
+    def __init__(self, base_url):
+        self.base_url = base_url.rstrip('/')
+        self.opener = urllib.request.build_opener(
+            urllib.request.HTTPCookieProcessor(CookieJar()), _NoRedirect()
+        )
+
+    def request(self, method, path, data=None, upload=None):
+        headers = {}
+        body = None
+        if upload:
+            body, content_type = _multipart(data or {}, upload)
+            headers['Content-Type'] = content_type
+        elif data is not None:
+            body = urlencode(data).encode('utf-8')
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
+        req = urllib.request.Request(self.base_url + path, data=body, headers=headers, method=method)
+        try:
+            with self.opener.open(req, timeout=60) as response:
+                return response.status, response.read()
+        except HTTPError as e:
+            return e.code, e.read()
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, req, fp, code, msg, headers, newurl):
+        return None
+
+
+def _multipart(fields, upload):
+    boundary = secrets.token_hex(16)
+    parts = []
+    for name, value in fields.items():
+        parts.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode('utf-8')
+        )
+    field, filename, content = upload
+    parts.append(
+        f'--{boundary}\r\nContent-Disposition: form-data; name="{field}"; filename="{filename}"\r\n'
+        f'Content-Type: application/octet-stream\r\n\r\n'.encode('utf-8') + content + b'\r\n'
+    )
+    parts.append(f'--{boundary}--\r\n'.encode('utf-8'))
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
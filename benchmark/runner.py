@@ -0,0 +1,122 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import json
+import os
+import subprocess
+import threading
+import time
+
+from benchmark.wizard import run_registration
+
+
+class Results:
+    def __init__(self):
+        self.latencies = {}  # маршрут -> список задержек в секундах
+        self.errors = {}  # маршрут -> число ошибок
+        self.lock_errors = 0
+        self.samples = []  # Несколько первых текстов ошибок для отчёта
+        self.completed = 0
+        self._lock = threading.Lock()
+
+    def record(self, route, elapsed):
+        with self._lock:
+            self.latencies.setdefault(route, []).append(elapsed)
+
+    def error(self, route, message, locked=False):
+        with self._lock:
+            self.errors[route] = self.errors.get(route, 0) + 1
+            self.lock_errors += bool(locked)
+            if len(self.samples) < 5:
+                self.samples.append(f'{route}: {message}')
+
+    def complete(self):
+        with self._lock:
+            self.completed += 1
+
+
+def run(make_client, registrations, concurrency, photo):
+    # Каждая регистрация идёт своим клиентом (своя сессия); concurrency регистраций одновременно
+    results = Results()
+
+    def one(n):
+        if run_registration(make_client(), n, photo, results):
+            results.complete()
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        list(executor.map(one, range(registrations)))
+    return summarize(results, time.perf_counter() - started)
+
+
+def percentile(values, p):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(p / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(results, duration):
+    requests = sum(len(values) for values in results.latencies.values())
+    return {
+        'duration': round(duration, 3),
+        'registrations': results.completed,
+        'registrations_per_second': round(results.completed / duration, 2),
+        'requests_per_second': round(requests / duration, 2),
+        'errors': results.errors,
+        'lock_errors': results.lock_errors,
+        'error_samples': results.samples,
+        'routes': {
+            route: {
+                'count': len(values),
+                'p50_ms': round(percentile(values, 50) * 1000, 1),
+                'p95_ms': round(percentile(values, 95) * 1000, 1),
+                'p99_ms': round(percentile(values, 99) * 1000, 1),
+            }
+            for route, values in results.latencies.items()
+        },
+    }
+
+
+def print_report(summary, previous=None):
+    print(f"Регистраций: {summary['registrations']} за {summary['duration']} с "
+          f"({summary['registrations_per_second']}/с, запросов {summary['requests_per_second']}/с)")
+    print(f"Ошибок: {sum(summary['errors'].values())}, из них блокировок базы: {summary['lock_errors']}")
+    for sample in summary['error_samples']:
+        print(f"  {sample}")
+    print(f"{'маршрут':<22}{'p50, мс':>10}{'p95, мс':>10}{'p99, мс':>10}{'было p95':>10}")
+    for route, stats in summary['routes'].items():
+        before = (previous or {}).get('routes', {}).get(route)
+        was = f"{before['p95_ms']:>10}" if before else f"{'-':>10}"
+        print(f"{route:<22}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['p99_ms']:>10}{was}")
+    if previous:
+        print(f"Предыдущий запуск ({previous['commit']}, {previous['time']}): "
+              f"{previous['registrations_per_second']} регистраций/с")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def save(path, config, summary):
+    # Результаты копятся в файле JSON Lines: одна строка - один запуск
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    entry = {'time': datetime.now().isoformat(timespec='seconds'), 'commit': git_commit(), 'config': config, **summary}
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+    return entry
+
+
+def previous_run(path, config):
+    # Последний сохранённый запуск с теми же параметрами, чтобы сравнить с ним
+    try:
+        with open(path, encoding='utf-8') as f:
+            runs = [json.loads(line) for line in f if line.strip()]
+    except FileNotFoundError:
+        return None
+    matching = [entry for entry in runs if entry.get('config') == config]
+    return matching[-1] if matching else None
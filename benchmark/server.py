@@ -0,0 +1,57 @@
+from contextlib import contextmanager
+import os
+import socket
+import subprocess
+import sys
+import time
+
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def migrate_database(env):
+    # Приложение само таблицы не создаёт: новая база для теста готовится миграциями
+    subprocess.run([sys.executable, '-m', 'flask', '--app', 'app', 'db', 'upgrade'],
+                   cwd=ROOT, env={**os.environ, **env}, check=True)
+
+
+@contextmanager
+def local_server(kind, workers, env):
+    # Запускает приложение под gunicorn или waitress на свободном порту и отдаёт его адрес
+    port = free_port()
+    if kind == 'gunicorn':
+        command = [sys.executable, '-m', 'gunicorn', '-w', str(workers), '-b', f'127.0.0.1:{port}', 'wsgi:app']
+    elif kind == 'waitress':
+        command = [sys.executable, '-m', 'waitress', f'--listen=127.0.0.1:{port}', f'--threads={workers}', 'wsgi:app']
+    else:
+        raise ValueError(f'Неизвестный сервер: {kind}')
+
+    process = subprocess.Popen(command, cwd=ROOT, env={**os.environ, **env})
+    try:
+        wait_for_port(port, process)
+        yield f'http://127.0.0.1:{port}'
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def wait_for_port(port, process, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f'Сервер завершился с кодом {process.returncode}')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError('Сервер не запустился')
@@ -0,0 +1,61 @@
+from io import BytesIO
+import random
+import time
+
+from PIL import Image
+
+
+# Шаги одной регистрации: (имя маршрута, метод, путь, поля формы, файл, ожидаемый статус)
+
+ERROR_MARKER = 'Ошибка'.encode('utf-8')
+CITIES = ['Минск', 'Гродно', 'Брест']
+
+
+def make_photo(width, height, seed=0):
+    # Шумная картинка плохо сжимается, поэтому по размеру похожа на фото с телефона
+    rng = random.Random(seed)
+    img = Image.frombytes('RGB', (width, height), rng.randbytes(width * height * 3))
+    out = BytesIO()
+    img.save(out, 'JPEG', quality=90)
+    return out.getvalue()
+
+
+def registration_steps(n, photo):
+    general = dict(comandName=f'Команда {n}', schoolName=f'Школа №{n % 50}', cityName=CITIES[n % len(CITIES)])
+    mentor = dict(mName=f'Ментор {n}', mPost='Учитель', memail=f'mentor{n}@example.com', mphoneNumber='+375290000000')
+    captain = dict(captainName=f'Капитан {n}', captainClass='10', cemail=f'captain{n}@example.com', cphoneNumber='+375290000001')
+    participant_1 = dict(uch1Name=f'Участник {n}-1', uch1Class='10', uch1email=f'p{n}-1@example.com', uch1phoneNumber='+375290000002')
+    participant_2 = dict(uch2Name=f'Участник {n}-2', uch2Class='11', uch2email=f'p{n}-2@example.com', uch2phoneNumber='+375290000003')
+    return [
+        ('create_user', 'GET', '/create_user', None, None, 302),
+        ('general_information', 'POST', '/general_information', general, None, 302),
+        ('mentor', 'POST', '/mentor', mentor, None, 302),
+        ('captain_info', 'POST', '/captain_info', captain, None, 302),
+        ('participant_1', 'POST', '/participant_1', participant_1, None, 302),
+        ('participant_2', 'POST', '/participant_2', participant_2, None, 302),
+        ('participant_3', 'POST', '/participant_3', dict(noParticipant='true'), None, 302),
+        ('photo', 'POST', '/photo', {}, ('file', f'team{n}.jpg', photo), 302),
+        ('final_check GET', 'GET', '/final_check', None, None, 200),
+        ('final_check POST', 'POST', '/final_check', {**general, **mentor, **captain, **participant_1, **participant_2}, None, 302),
+        ('registration_end', 'GET', '/registration_end', None, None, 200),
+    ]
+
+
+def run_registration(client, n, photo, results):
+    # Проходит анкету одним клиентом (своя сессия); при первой ошибке регистрация прерывается
+    for route, method, path, data, upload, expected in registration_steps(n, photo):
+        started = time.perf_counter()
+        try:
+            status, body = client.request(method, path, data, upload)
+        except Exception as e:
+            results.error(route, f'{type(e).__name__}: {e}')
+            return False
+        elapsed = time.perf_counter() - started
+
+        # Обработчики при исключении отвечают 200 с текстом "Ошибка: ..." вместо редиректа
+        if status != expected or (expected == 302 and ERROR_MARKER in body):
+            text = body[:300].decode('utf-8', 'replace')
+            results.error(route, f'HTTP {status}: {text}', locked='locked' in text or 'busy' in text)
+            return False
+        results.record(route, elapsed)
+    return True
@@ -0,0 +1,109 @@
+from io import BytesIO
+import hashlib
+import os
+import tempfile
+import time
+
+
+# Хранилище файлов по содержимому: имя файла = sha256 от данных.
+# Одинаковые загрузки попадают в один и тот же файл (дедупликация).
+
+CHUNK_SIZE = 64 * 1024
+
+
+class BlobStore:
+    def __init__(self, root):
+        self.root = root
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, digest):
+        # Раскладываем по подпапкам, чтобы не держать тысячи файлов в одной директории
+        return os.path.join(self.root, digest[:2], digest)
+
+    def exists(self, digest):
+        return os.path.exists(self.path(digest))
+
+    def put(self, data):
+        return self.put_stream(BytesIO(data))
+
+    def put_stream(self, stream):
+        # Пишем во временный файл, параллельно считая хеш, затем атомарно переименовываем
+        sha = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                while True:
+                    chunk = stream.read(CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    sha.update(chunk)
+                    tmp.write(chunk)
+                    size += len(chunk)
+                tmp.flush()
+                os.fsync(tmp.fileno())
+
+            digest = sha.hexdigest()
+            target = self.path(digest)
+            try:
+                # Такой файл уже есть; обновляем mtime, чтобы sweep_unused() не удалил его,
+                # пока запись, которая на него ссылается, ещё не сохранена
+                os.utime(target)
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                os.replace(tmp_path, target)
+            return digest, size
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+
+    def open(self, digest):
+        return open(self.path(digest), 'rb')
+
+    def read(self, digest):
+        with self.open(digest) as f:
+            return f.read()
+
+    def sweep_unused(self, in_use, older_than):
+        # Удаляет файлы, на которые не ссылается база (in_use(digests) -> множество используемых хешей)
+        # и которые не трогали дольше older_than секунд. Файл сначала переименовывается: если его успела
+        # переиспользовать параллельная загрузка (свежий mtime), он возвращается на место.
+        # Заодно удаляются старые временные файлы .upload-* прерванных загрузок из корня хранилища
+        cutoff = time.time() - older_than
+        candidates = []
+        deleted = 0
+        for directory in os.scandir(self.root):
+            if not directory.is_dir():
+                try:
+                    if directory.name.startswith('.upload-') and directory.stat().st_mtime < cutoff:
+                        os.unlink(directory.path)
+                        deleted += 1
+                except FileNotFoundError:
+                    pass  # Загрузка как раз закончилась и переименовала файл
+                continue
+            for entry in os.scandir(directory.path):
+                if entry.stat().st_mtime >= cutoff:
+                    continue
+                if entry.name.endswith('.deleting'):
+                    os.unlink(entry.path)  # Остался от прерванного удаления
+                else:
+                    candidates.append(entry.name)
+        used = in_use(candidates) if candidates else set()
+        for digest in candidates:
+            if digest in used:
+                continue
+            path = self.path(digest)
+            trash = f'{path}.deleting'
+            try:
+                os.rename(path, trash)
+            except FileNotFoundError:
+                continue
+            if os.stat(trash).st_mtime >= cutoff:
+                os.replace(trash, path)
+            else:
+                os.unlink(trash)
+                deleted += 1
+        return deleted
+
@@ -0,0 +1,3 @@
+# Бот Telegram для регистрации: python -m bot --help
+# Открывает форму как мини-приложение и ставит в очередь напоминания тем, кто не закончил регистрацию;
+# отправляет их, как и подтверждения, flask dispatch-outbox. Работает с той же базой анкет, что и сайт.
@@ -0,0 +1,81 @@
+from urllib.parse import urlparse
+import argparse
+import asyncio
+import logging
+import secrets
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+
+from app import create_app
+from bot.handlers import router
+from bot.notifications import notification_loop
+
+
+def make_bot(config):
+    # TELEGRAM_API_SERVER - свой Bot API сервер (telegram-bot-api или заглушка для тестов) вместо api.telegram.org
+    session = None
+    if config['TELEGRAM_API_SERVER']:
+        session = AiohttpSession(api=TelegramAPIServer.from_base(config['TELEGRAM_API_SERVER']))
+    return Bot(config['TELEGRAM_BOT_TOKEN'], session=session)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog='python -m bot',
+        description='Бот регистрации: мини-приложение с формой и напоминания закончить регистрацию.'
+    )
+    parser.add_argument('--webhook-url', help='Публичный адрес для webhook; без него бот забирает обновления сам (long polling)')
+    parser.add_argument('--host', default='127.0.0.1', help='Где слушать webhook')
+    parser.add_argument('--port', type=int, default=8081, help='Порт для webhook')
+    parser.add_argument('--notify-interval', type=int, default=60, help='Как часто проверять, кому пора написать, секунд')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    flask_app = create_app()
+    if not flask_app.config['TELEGRAM_BOT_TOKEN']:
+        parser.error('не задан TELEGRAM_BOT_TOKEN')
+
+    bot = make_bot(flask_app.config)
+    dp = Dispatcher(flask_app=flask_app)
+    dp.include_router(router)
+    tasks = []
+
+    async def start_notifications():
+        tasks.append(asyncio.create_task(notification_loop(flask_app, args.notify_interval)))
+
+    async def stop_notifications():
+        for task in tasks:
+            task.cancel()
+
+    dp.startup.register(start_notifications)
+    dp.shutdown.register(stop_notifications)
+
+    if args.webhook_url:
+        from aiohttp import web
+        from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+
+        # Telegram присылает секрет в заголовке каждого запроса, чужие запросы отклоняются
+        secret_token = secrets.token_urlsafe(32)
+
+        async def set_webhook(bot):
+            await bot.set_webhook(args.webhook_url, secret_token=secret_token)
+
+        dp.startup.register(set_webhook)
+        web_app = web.Application()
+        SimpleRequestHandler(dp, bot, secret_token=secret_token).register(
+            web_app, path=urlparse(args.webhook_url).path or '/'
+        )
+        setup_application(web_app, dp, bot=bot)
+        web.run_app(web_app, host=args.host, port=args.port)
+    else:
+        async def polling():
+            await bot.delete_webhook()
+            await dp.start_polling(bot)
+
+        asyncio.run(polling())
+
+
+if __name__ == '__main__':
+    main()
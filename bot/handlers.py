@@ -0,0 +1,33 @@
+from aiogram import Router
+from aiogram.filters import Command, CommandStart
+from aiogram.types import Message
+
+from bot import store
+from bot.notifications import STAGE_TITLES, registration_keyboard
+from stats import registration_stage
+
+
+# Команды бота. flask_app передаётся в обработчики из Dispatcher(flask_app=...)
+
+router = Router()
+
+
+@router.message(CommandStart())
+async def start(message: Message, flask_app):
+    await message.answer(
+        "Здравствуйте! Здесь можно зарегистрировать команду. Нажмите кнопку ниже, чтобы открыть форму. "
+        "Когда регистрация будет завершена, я пришлю подтверждение. /status - состояние вашей регистрации.",
+        reply_markup=registration_keyboard(flask_app)
+    )
+
+
+@router.message(Command('status'))
+async def status(message: Message, flask_app):
+    snapshot = await store.call(flask_app, store.registration_status, message.from_user.id)
+    if snapshot is None:
+        text = "Вы ещё не начинали регистрацию. Откройте форму кнопкой ниже."
+    elif snapshot['confirmed']:
+        text = f"Регистрация команды «{snapshot['comandName']}» завершена."
+    else:
+        text = f"Регистрация не закончена. Продолжите с шага «{STAGE_TITLES[registration_stage(snapshot)]}»."
+    await message.answer(text, reply_markup=registration_keyboard(flask_app, 'Продолжить регистрацию'))
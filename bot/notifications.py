@@ -0,0 +1,57 @@
+from functools import partial
+import asyncio
+import logging
+
+from aiogram.types import InlineKeyboardButton, InlineKeyboardMarkup, WebAppInfo
+
+from bot import store
+
+
+# Напоминания закончить регистрацию. Бот только ставит их в outbox_message вместе с отметкой
+# в таблице user, а отправляет flask dispatch-outbox - так же, как подтверждения регистрации.
+# После перезапуска бот продолжает с того же места.
+
+log = logging.getLogger(__name__)
+
+# Названия шагов формы, на которых пользователь мог остановиться
+STAGE_TITLES = {
+    'general_information': 'Общая информация',
+    'mentor': 'Наставник',
+    'captain_info': 'Капитан',
+    'participant_1': 'Участник 1',
+    'participant_2': 'Участник 2',
+    'photo': 'Фото команды',
+    'final_check': 'Проверка данных',
+}
+
+
+def registration_keyboard(flask_app, text='Открыть регистрацию'):
+    url = flask_app.config.get('TELEGRAM_WEBAPP_URL')
+    if not url:
+        return None
+    return InlineKeyboardMarkup(inline_keyboard=[[InlineKeyboardButton(text=text, web_app=WebAppInfo(url=url))]])
+
+
+def reminder_message(flask_app, snapshot, stage):
+    # Параметры sendMessage для Bot API
+    team = f" команды «{snapshot['comandName']}»" if snapshot['comandName'] else ''
+    message = {'text': f"Регистрация{team} не закончена. Продолжите с шага «{STAGE_TITLES[stage]}»."}
+    keyboard = registration_keyboard(flask_app, 'Продолжить регистрацию')
+    if keyboard:
+        message['reply_markup'] = keyboard.model_dump(exclude_none=True)
+    return message
+
+
+async def notification_loop(flask_app, interval, batch_size=100):
+    make_message = partial(reminder_message, flask_app)
+    while True:
+        try:
+            while True:
+                scheduled = await store.call(flask_app, store.schedule_reminders, batch_size, make_message)
+                if scheduled:
+                    log.info("Поставлено напоминаний: %d", scheduled)
+                if scheduled < batch_size:
+                    break
+        except Exception:
+            log.exception("Ошибка при постановке напоминаний")
+        await asyncio.sleep(interval)
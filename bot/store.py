@@ -0,0 +1,53 @@
+import asyncio
+from datetime import datetime
+
+from flask import current_app
+from sqlalchemy import or_
+
+from app import User, db, enqueue_message, registration_snapshot, run_with_retry, snapshot_query
+from stats import registration_stage
+
+
+# Обращения бота к базе анкет. Функции синхронные (Flask-SQLAlchemy), поэтому бот вызывает их
+# в отдельном потоке внутри контекста приложения: await call(flask_app, функция, аргументы...)
+
+async def call(flask_app, fn, *args):
+    def work():
+        with flask_app.app_context():
+            return fn(*args)
+    return await asyncio.to_thread(work)
+
+
+def registration_status(telegram_id):
+    # Анкета пользователя Telegram (словарь как у registration_snapshot и confirmed) или None, если её нет
+    user = User.query.filter_by(telegram_id=telegram_id).first()
+    if not user:
+        return None
+    return dict(registration_snapshot(user.id), confirmed=user.confirmation_sent_at is not None)
+
+
+def schedule_reminders(limit, make_message):
+    # Ставит в outbox напоминания тем, кто не подтвердил регистрацию: не чаще TELEGRAM_REMINDER_INTERVAL
+    # и не больше TELEGRAM_MAX_REMINDERS раз. make_message(snapshot, stage) - параметры sendMessage.
+    # Отметка о напоминании и само сообщение пишутся одной транзакцией; возвращает число напоминаний
+    config = current_app.config
+    now = datetime.utcnow()
+    query = snapshot_query().add_columns(User.telegram_id).where(
+        User.telegram_id.isnot(None),
+        User.confirmation_sent_at.is_(None),
+        User.reminders_sent < config['TELEGRAM_MAX_REMINDERS'],
+        User.created_at < now - config['TELEGRAM_REMINDER_DELAY'],
+        or_(User.reminder_sent_at.is_(None), User.reminder_sent_at < now - config['TELEGRAM_REMINDER_INTERVAL'])
+    ).order_by(User.id).limit(limit)
+
+    def schedule():
+        rows = db.session.execute(query).all()
+        for row in rows:
+            snapshot = row._asdict()
+            enqueue_message('telegram', row.telegram_id, **make_message(snapshot, registration_stage(snapshot)))
+        User.query.filter(User.id.in_([row.user_id for row in rows])).update(
+            {'reminder_sent_at': now, 'reminders_sent': User.reminders_sent + 1}, synchronize_session=False
+        )
+        return len(rows)
+
+    return run_with_retry(schedule)
@@ -0,0 +1,160 @@
+from datetime import datetime
+from xml.sax.saxutils import escape
+import csv
+import io
+import json
+import zipfile
+
+
+# Потоковая выгрузка анкет: каждая функция принимает заголовок и итератор строк
+# и отдаёт байты частями, не собирая весь файл в памяти.
+
+FLUSH_EVERY = 200  # Сколько строк копить перед отдачей очередной части
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _safe_text(value):
+    # Поля анкеты вводит пользователь: "=HYPERLINK(...)" в названии команды Excel выполнил бы как формулу.
+    # Апостроф в начале заставляет показать значение как текст
+    value = str(value)
+    return "'" + value if value.startswith(FORMULA_PREFIXES) else value
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    return value if isinstance(value, (int, float)) else _safe_text(value)
+
+
+def csv_chunks(header, rows):
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    buf.write('\ufeff')  # BOM, чтобы Excel правильно открыл кириллицу
+    writer.writerow(header)
+    for i, row in enumerate(rows, 1):
+        writer.writerow([_csv_value(value) for value in row])
+        if i % FLUSH_EVERY == 0:
+            yield buf.getvalue().encode('utf-8')
+            buf.seek(0)
+            buf.truncate()
+    yield buf.getvalue().encode('utf-8')
+
+
+def json_chunks(header, rows):
+    yield b'['
+    for i, row in enumerate(rows):
+        item = json.dumps(dict(zip(header, row)), ensure_ascii=False, default=str)
+        yield (',\n' if i else '\n').encode('utf-8') + item.encode('utf-8')
+    yield b'\n]\n'
+
+
+def xlsx_chunks(header, rows):
+    # Минимальная книга Excel из одного листа; строки пишутся как inlineStr, поэтому без общей таблицы строк
+    return zip_stream([
+        ('[Content_Types].xml', [XLSX_CONTENT_TYPES], True),
+        ('_rels/.rels', [XLSX_RELS], True),
+        ('xl/workbook.xml', [XLSX_WORKBOOK], True),
+        ('xl/_rels/workbook.xml.rels', [XLSX_WORKBOOK_RELS], True),
+        ('xl/worksheets/sheet1.xml', _sheet_xml(header, rows), True),
+    ])
+
+
+def _sheet_xml(header, rows):
+    yield (b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+           b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+    yield _xlsx_row(header)
+    for row in rows:
+        yield _xlsx_row(row)
+    yield b'</sheetData></worksheet>'
+
+
+def _xlsx_row(values):
+    cells = []
+    for value in values:
+        if value is None:
+            cells.append('<c/>')
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            cells.append(f'<c><v>{value}</v></c>')
+        else:
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_safe_text(value))}</t></is></c>')
+    return ('<row>' + ''.join(cells) + '</row>').encode('utf-8')
+
+
+def zip_stream(entries):
+    # entries: (имя в архиве, итератор байтов, сжимать ли). Архив пишется в буфер без поддержки seek,
+    # zipfile в этом случае сам добавляет data descriptor, и готовые байты сразу отдаются наружу
+    buf = _StreamBuffer()
+    with zipfile.ZipFile(buf, 'w') as zf:
+        for name, chunks, compress in entries:
+            info = zipfile.ZipInfo(name, date_time=datetime.now().timetuple()[:6])
+            info.compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+            with zf.open(info, 'w', force_zip64=True) as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    data = buf.pop()
+                    if data:
+                        yield data
+            yield buf.pop()
+    yield buf.pop()
+
+
+class _StreamBuffer:
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+XLSX_CONTENT_TYPES = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+    b'<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+    b'<Default Extension="xml" ContentType="application/xml"/>'
+    b'<Override PartName="/xl/workbook.xml" '
+    b'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+    b'<Override PartName="/xl/worksheets/sheet1.xml" '
+    b'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+    b'</Types>'
+)
+
+XLSX_RELS = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    b'<Relationship Id="rId1" '
+    b'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+    b'Target="xl/workbook.xml"/>'
+    b'</Relationships>'
+)
+
+XLSX_WORKBOOK = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+    b'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+    b'<sheets><sheet name="Registrations" sheetId="1" r:id="rId1"/></sheets>'
+    b'</workbook>'
+)
+
+XLSX_WORKBOOK_RELS = (
+    b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+    b'<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+    b'<Relationship Id="rId1" '
+    b'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+    b'Target="worksheets/sheet1.xml"/>'
+    b'</Relationships>'
+)
+
+FORMATS = {
+    'csv': (csv_chunks, 'text/csv; charset=utf-8'),
+    'json': (json_chunks, 'application/json'),
+    'xlsx': (xlsx_chunks, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+}
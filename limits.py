@@ -0,0 +1,73 @@
+import math
+import os
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# Защита от наплыва при открытии регистрации: ограничение частоты запросов на клиента (token bucket)
+# и общее число одновременных загрузок фото. Лишние запросы сразу получают 429 с Retry-After,
+# а не стоят в очереди, пока не истечёт таймаут у всех.
+
+class RateLimiter:
+    def __init__(self, rate, burst):
+        self.rate = rate  # Сколько запросов в секунду восполняется
+        self.burst = burst  # Сколько запросов можно сделать подряд
+        self._lock = threading.Lock()
+        self._buckets = {}  # ключ клиента -> (оставшиеся токены, время последнего обновления)
+        self._pruned = time.monotonic()
+
+    def acquire(self, key):
+        # Возвращает 0, если запрос можно выполнить, иначе через сколько секунд появится токен
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.burst, now))
+            tokens = min(self.burst, tokens + (now - updated) * self.rate)
+            if tokens >= 1:
+                self._buckets[key] = (tokens - 1, now)
+                retry_after = 0
+            else:
+                self._buckets[key] = (tokens, now)
+                retry_after = math.ceil((1 - tokens) / self.rate)
+            if now - self._pruned > 60:
+                self._prune(now)
+        return retry_after
+
+    def _prune(self, now):
+        # Клиенты, чьи корзины уже снова полны, ничем не отличаются от новых - их можно забыть
+        full_after = self.burst / self.rate
+        self._buckets = {key: value for key, value in self._buckets.items() if now - value[1] < full_after}
+        self._pruned = now
+
+
+class UploadSlots:
+    # Не больше limit одновременных загрузок на весь сервер: слот - файл в общей папке, занятый через flock.
+    # Блокировку снимает система, даже если процесс упал. Без fcntl (Windows) ограничение действует в пределах процесса
+    def __init__(self, root, limit):
+        self.root = root
+        self.limit = limit
+        self._semaphore = threading.BoundedSemaphore(limit) if fcntl is None else None
+        os.makedirs(self.root, exist_ok=True)
+
+    def acquire(self):
+        # Возвращает занятый слот или None, если все заняты; ждать свободного слота не будем
+        if self._semaphore is not None:
+            return True if self._semaphore.acquire(blocking=False) else None
+        for number in range(self.limit):
+            f = open(os.path.join(self.root, f'{number}.lock'), 'w')
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return f
+            except BlockingIOError:
+                f.close()
+        return None
+
+    def release(self, slot):
+        if self._semaphore is not None:
+            self._semaphore.release()
+        else:
+            slot.close()
@@ -0,0 +1,88 @@
+import threading
+
+
+# Метрики запросов в формате Prometheus: гистограммы времени ответа, числа и времени SQL-запросов,
+# размеров тела запроса и ответа по каждому обработчику. Считаются в памяти процесса,
+# поэтому под gunicorn каждый воркер отдаёт свои значения (Prometheus различает их по instance/pid).
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50)
+SIZE_BUCKETS = (1024, 10 * 1024, 100 * 1024, 1024 ** 2, 4 * 1024 ** 2, 16 * 1024 ** 2, 64 * 1024 ** 2)
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0
+        self.sum = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.total += 1
+        self.sum += value
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = {}  # (endpoint, method, status) -> число запросов
+        self.histograms = {}  # (имя метрики, endpoint, method) -> Histogram
+        self.rejections = {}  # (причина, endpoint) -> число запросов, отклонённых с 429
+
+    def observe(self, endpoint, method, status, duration, queries, query_time, request_bytes, response_bytes):
+        with self._lock:
+            key = (endpoint, method, str(status))
+            self.requests[key] = self.requests.get(key, 0) + 1
+            self._observe('http_request_duration_seconds', DURATION_BUCKETS, endpoint, method, duration)
+            self._observe('db_queries_per_request', QUERY_BUCKETS, endpoint, method, queries)
+            self._observe('db_query_duration_seconds_per_request', DURATION_BUCKETS, endpoint, method, query_time)
+            if request_bytes is not None:
+                self._observe('http_request_size_bytes', SIZE_BUCKETS, endpoint, method, request_bytes)
+            if response_bytes is not None:
+                self._observe('http_response_size_bytes', SIZE_BUCKETS, endpoint, method, response_bytes)
+
+    def reject(self, reason, endpoint):
+        with self._lock:
+            key = (reason, endpoint)
+            self.rejections[key] = self.rejections.get(key, 0) + 1
+
+    def _observe(self, name, buckets, endpoint, method, value):
+        key = (name, endpoint, method)
+        if key not in self.histograms:
+            self.histograms[key] = Histogram(buckets)
+        self.histograms[key].observe(value)
+
+    def render(self):
+        # Текстовый формат Prometheus (text/plain; version=0.0.4)
+        with self._lock:
+            lines = ['# TYPE http_requests_total counter']
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                lines.append(f'http_requests_total{{{_labels(endpoint, method)},status="{status}"}} {count}')
+
+            lines.append('# TYPE http_requests_rejected_total counter')
+            for (reason, endpoint), count in sorted(self.rejections.items()):
+                lines.append(f'http_requests_rejected_total{{endpoint="{_escape(endpoint)}",reason="{reason}"}} {count}')
+
+            current = None
+            for (name, endpoint, method), histogram in sorted(self.histograms.items()):
+                if name != current:
+                    lines.append(f'# TYPE {name} histogram')
+                    current = name
+                labels = _labels(endpoint, method)
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.total}')
+                lines.append(f'{name}_sum{{{labels}}} {histogram.sum}')
+                lines.append(f'{name}_count{{{labels}}} {histogram.total}')
+        return '\n'.join(lines) + '\n'
+
+
+def _labels(endpoint, method):
+    return f'endpoint="{_escape(endpoint)}",method="{method}"'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
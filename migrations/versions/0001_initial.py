@@ -0,0 +1,72 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+SECTIONS = {
+    'general_information': ['comandName', 'schoolName', 'cityName'],
+    'mentor': ['mName', 'mPost', 'memail', 'mphoneNumber'],
+    'captain_info': ['captainName', 'captainClass', 'cemail', 'cphoneNumber'],
+    'participant1': ['uch1Name', 'uch1Class', 'uch1email', 'uch1phoneNumber'],
+    'participant2': ['uch2Name', 'uch2Class', 'uch2email', 'uch2phoneNumber'],
+    'participant3': ['uch3Name', 'uch3Class', 'uch3email', 'uch3phoneNumber'],
+}
+
+
+def upgrade():
+    # Базы, созданные раньше через db.create_all(), уже содержат эти таблицы
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'user' not in existing:
+        op.create_table(
+            'user',
+            sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    for table, fields in SECTIONS.items():
+        if table in existing:
+            continue
+        columns = [
+            sa.Column(name, sa.Integer() if name.endswith('Class') else sa.Text(), nullable=False)
+            for name in fields
+        ]
+        op.create_table(
+            table,
+            sa.Column('id', sa.Integer(), nullable=False),
+            *columns,
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'photo' not in existing:
+        op.create_table(
+            'photo',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('filename', sa.Text(), nullable=False),
+            sa.Column('data', sa.LargeBinary(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=False),
+            sa.ForeignKeyConstraint(['user_id'], ['user.id']),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('photo')
+    for table in reversed(list(SECTIONS)):
+        op.drop_table(table)
+    op.drop_table('user')
@@ -0,0 +1,74 @@
+"""move photo data to the blob store
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+from alembic import op
+from flask import current_app
+import mimetypes
+import sqlalchemy as sa
+
+from blob_store import BlobStore
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('photo') as batch_op:
+        batch_op.add_column(sa.Column('sha256', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('size', sa.Integer(), nullable=True))
+        batch_op.add_column(sa.Column('mimetype', sa.Text(), nullable=True))
+
+    # Переносим содержимое по одной записи, чтобы не держать все фото в памяти
+    bind = op.get_bind()
+    store = BlobStore(current_app.config['PHOTO_STORAGE_PATH'])
+    ids = [row.id for row in bind.execute(sa.text('SELECT id FROM photo'))]
+    for photo_id in ids:
+        row = bind.execute(
+            sa.text('SELECT filename, data FROM photo WHERE id = :id'), {'id': photo_id}
+        ).one()
+        digest, size = store.put(row.data)
+        bind.execute(
+            sa.text('UPDATE photo SET sha256 = :sha256, size = :size, mimetype = :mimetype WHERE id = :id'),
+            {
+                'sha256': digest,
+                'size': size,
+                'mimetype': mimetypes.guess_type(row.filename)[0] or 'image/jpeg',
+                'id': photo_id,
+            }
+        )
+
+    with op.batch_alter_table('photo') as batch_op:
+        batch_op.drop_column('data')
+        batch_op.alter_column('sha256', existing_type=sa.String(length=64), nullable=False)
+        batch_op.alter_column('size', existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column('mimetype', existing_type=sa.Text(), nullable=False)
+        batch_op.create_index('ix_photo_sha256', ['sha256'])
+
+
+def downgrade():
+    with op.batch_alter_table('photo') as batch_op:
+        batch_op.drop_index('ix_photo_sha256')
+        batch_op.add_column(sa.Column('data', sa.LargeBinary(), nullable=True))
+
+    bind = op.get_bind()
+    store = BlobStore(current_app.config['PHOTO_STORAGE_PATH'])
+    rows = bind.execute(sa.text('SELECT id, sha256 FROM photo')).all()
+    for row in rows:
+        bind.execute(
+            sa.text('UPDATE photo SET data = :data WHERE id = :id'),
+            {'data': store.read(row.sha256), 'id': row.id}
+        )
+
+    with op.batch_alter_table('photo') as batch_op:
+        batch_op.alter_column('data', existing_type=sa.LargeBinary(), nullable=False)
+        batch_op.drop_column('mimetype')
+        batch_op.drop_column('size')
+        batch_op.drop_column('sha256')
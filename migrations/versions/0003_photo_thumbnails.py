@@ -0,0 +1,31 @@
+"""photo thumbnails
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 12:20:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Старые фото остаются без превью, для них ?size=thumb отдаёт оригинал
+    with op.batch_alter_table('photo') as batch_op:
+        batch_op.add_column(sa.Column('thumb_sha256', sa.String(length=64), nullable=True))
+        batch_op.add_column(sa.Column('thumb_size', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_photo_thumb_sha256', ['thumb_sha256'])
+
+
+def downgrade():
+    with op.batch_alter_table('photo') as batch_op:
+        batch_op.drop_index('ix_photo_thumb_sha256')
+        batch_op.drop_column('thumb_size')
+        batch_op.drop_column('thumb_sha256')
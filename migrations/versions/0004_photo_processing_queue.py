@@ -0,0 +1,30 @@
+"""photo processing status
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 12:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('photo') as batch_op:
+        batch_op.add_column(sa.Column('status', sa.String(length=16), nullable=False, server_default='ready'))
+        batch_op.add_column(sa.Column('claimed_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_photo_status', ['status'])
+
+
+def downgrade():
+    with op.batch_alter_table('photo') as batch_op:
+        batch_op.drop_index('ix_photo_status')
+        batch_op.drop_column('claimed_at')
+        batch_op.drop_column('status')
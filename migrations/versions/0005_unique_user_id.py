@@ -0,0 +1,39 @@
+"""unique index on user_id in section tables
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+
+TABLES = [
+    'general_information', 'mentor', 'captain_info',
+    'participant1', 'participant2', 'participant3', 'photo'
+]
+
+
+def upgrade():
+    for table in TABLES:
+        # Если у пользователя накопилось несколько записей, оставляем последнюю
+        op.execute(sa.text(
+            f'DELETE FROM {table} WHERE id NOT IN '
+            f'(SELECT max_id FROM (SELECT MAX(id) AS max_id FROM {table} GROUP BY user_id) AS latest)'
+        ))
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.create_index(f'ix_{table}_user_id', ['user_id'], unique=True)
+
+
+def downgrade():
+    for table in reversed(TABLES):
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_index(f'ix_{table}_user_id')
@@ -0,0 +1,71 @@
+"""full-text search index over registrations
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+# Поля, по которым ищут команды; должны совпадать с SEARCH_COLUMNS в app.py
+SEARCH_COLUMNS = [
+    ('general_information', ['comandName', 'schoolName', 'cityName']),
+    ('mentor', ['mName', 'memail']),
+    ('captain_info', ['captainName', 'cemail']),
+    ('participant1', ['uch1Name', 'uch1email']),
+    ('participant2', ['uch2Name', 'uch2email']),
+    ('participant3', ['uch3Name', 'uch3email']),
+]
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # rowid совпадает с user.id
+        op.execute(
+            "CREATE VIRTUAL TABLE registration_search USING fts5(document, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        key = 'rowid'
+    else:
+        op.create_table(
+            'registration_search',
+            sa.Column('user_id', sa.Integer(), sa.ForeignKey('user.id', ondelete='CASCADE'), primary_key=True),
+            sa.Column('document', sa.Text(), nullable=False)
+        )
+        if dialect == 'postgresql':
+            op.execute(
+                "CREATE INDEX ix_registration_search_document ON registration_search "
+                "USING gin (to_tsvector('simple', document))"
+            )
+        key = 'user_id'
+
+    # Заполняем индекс по уже сохранённым анкетам
+    user = sa.table('user', sa.column('id'))
+    tables = [sa.table(table, sa.column('user_id'), *[sa.column(name) for name in names]) for table, names in SEARCH_COLUMNS]
+    query = sa.select(user.c.id, *[t.c[name] for t, (_, names) in zip(tables, SEARCH_COLUMNS) for name in names])
+    joined = user
+    for t in tables:
+        joined = joined.outerjoin(t, t.c.user_id == user.c.id)
+    documents = []
+    for row in op.get_bind().execute(query.select_from(joined)):
+        document = ' '.join(str(value) for value in row[1:] if value)
+        if document:
+            documents.append({'key': row[0], 'document': document})
+    if documents:
+        op.get_bind().execute(
+            sa.text(f'INSERT INTO registration_search ({key}, document) VALUES (:key, :document)'),
+            documents
+        )
+
+
+def downgrade():
+    op.drop_table('registration_search')
@@ -0,0 +1,66 @@
+"""registration statistics counters
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 15:30:00.000000
+
+"""
+from collections import Counter
+
+from alembic import op
+import sqlalchemy as sa
+
+from stats import registration_counters
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+
+# Разделы и поля анкеты, из которых считается статистика (как snapshot_query в app.py)
+SNAPSHOT_COLUMNS = [
+    ('general_information', ['schoolName', 'cityName']),
+    ('mentor', []),
+    ('captain_info', ['captainClass']),
+    ('participant1', ['uch1Class']),
+    ('participant2', ['uch2Class']),
+    ('participant3', ['uch3Class']),
+    ('photo', []),
+]
+
+
+def upgrade():
+    # Дальше счётчики обновляются при каждой записи анкеты на разницу "до" и "после",
+    # поэтому сразу заполняем их по уже сохранённым анкетам - так же, как flask rebuild-stats
+    stat = op.create_table(
+        'registration_stat',
+        sa.Column('dimension', sa.String(length=32), nullable=False),
+        sa.Column('value', sa.String(length=255), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('dimension', 'value')
+    )
+
+    user = sa.table('user', sa.column('id'))
+    tables = [sa.table(table, sa.column('id'), sa.column('user_id'), *[sa.column(name) for name in names])
+              for table, names in SNAPSHOT_COLUMNS]
+    query = sa.select(
+        *[t.c[name] for t, (_, names) in zip(tables, SNAPSHOT_COLUMNS) for name in names],
+        *[t.c.id.label(table) for t, (table, _) in zip(tables, SNAPSHOT_COLUMNS)]
+    )
+    joined = user
+    for t in tables:
+        joined = joined.outerjoin(t, t.c.user_id == user.c.id)
+    totals = Counter()
+    for row in op.get_bind().execute(query.select_from(joined)):
+        totals.update(registration_counters(row._asdict()))
+    if totals:
+        op.bulk_insert(stat, [
+            dict(dimension=dimension, value=value, count=count) for (dimension, value), count in sorted(totals.items())
+        ])
+
+
+def downgrade():
+    op.drop_table('registration_stat')
@@ -0,0 +1,34 @@
+"""user creation time for sweeping abandoned registrations
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 18:10:00.000000
+
+"""
+from datetime import datetime
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0009'
+down_revision = '0008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('created_at', sa.DateTime(), nullable=True))
+        batch_op.create_index('ix_user_created_at', ['created_at'])
+    # Время создания старых записей неизвестно; считаем их созданными сейчас,
+    # чтобы не удалить пользователя, у которого ещё открыта сессия
+    user = sa.table('user', sa.column('created_at', sa.DateTime()))
+    op.execute(user.update().values(created_at=datetime.utcnow()))
+
+
+def downgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_index('ix_user_created_at')
+        batch_op.drop_column('created_at')
@@ -0,0 +1,34 @@
+"""telegram binding and bot notification state
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 19:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0010'
+down_revision = '0009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('telegram_id', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('confirmation_sent_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('reminder_sent_at', sa.DateTime(), nullable=True))
+        batch_op.add_column(sa.Column('reminders_sent', sa.Integer(), nullable=False, server_default='0'))
+        batch_op.create_index('ix_user_telegram_id', ['telegram_id'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_index('ix_user_telegram_id')
+        batch_op.drop_column('reminders_sent')
+        batch_op.drop_column('reminder_sent_at')
+        batch_op.drop_column('confirmation_sent_at')
+        batch_op.drop_column('telegram_id')
@@ -0,0 +1,47 @@
+"""bitmap of saved registration sections
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 21:40:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0012'
+down_revision = '0011'
+branch_labels = None
+depends_on = None
+
+
+# Биты разделов, как COMPLETION_BITS в app.py
+SECTION_BITS = {
+    'general_information': 1,
+    'mentor': 2,
+    'captain_info': 4,
+    'participant1': 8,
+    'participant2': 16,
+    'participant3': 32,
+    'photo': 64,
+}
+
+
+def upgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.add_column(sa.Column('completed', sa.Integer(), nullable=False, server_default='0'))
+
+    user = sa.table('user', sa.column('id', sa.Integer()), sa.column('completed', sa.Integer()))
+    for table_name, bit in SECTION_BITS.items():
+        section = sa.table(table_name, sa.column('user_id', sa.Integer()))
+        op.execute(
+            user.update()
+            .where(sa.exists().where(section.c.user_id == user.c.id))
+            .values(completed=user.c.completed + bit)
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('user') as batch_op:
+        batch_op.drop_column('completed')
@@ -0,0 +1,36 @@
+"""server-side sessions table for SESSION_BACKEND=sqlalchemy
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 22:30:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0013'
+down_revision = '0012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Таблица в том виде, в каком её ждёт Flask-Session (SESSION_SQLALCHEMY_TABLE = 'sessions').
+    # Раньше она создавалась при запуске приложения, поэтому в существующей базе может уже быть
+    if sa.inspect(op.get_bind()).has_table('sessions'):
+        return
+    op.create_table(
+        'sessions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('session_id', sa.String(length=255), nullable=True),
+        sa.Column('data', sa.LargeBinary(), nullable=True),
+        sa.Column('expiry', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('session_id', name='uq_sessions_session_id')
+    )
+
+
+def downgrade():
+    op.drop_table('sessions')
@@ -0,0 +1,96 @@
+from email.message import EmailMessage
+from urllib.error import HTTPError, URLError
+import json
+import random
+import smtplib
+import urllib.request
+
+
+# Доставка сообщений из таблицы outbox_message (письма и сообщения Telegram).
+# Сообщения пишутся в базу в той же транзакции, что и анкета, а отправляет их отдельный
+# процесс (flask dispatch-outbox), поэтому медленная почта или Telegram не задерживают ответ пользователю.
+
+class DeliveryError(Exception):
+    def __init__(self, message, retry_after=None, permanent=False):
+        super().__init__(message)
+        self.retry_after = retry_after  # Получатель сам сказал, через сколько секунд повторить
+        self.permanent = permanent  # Повторять бессмысленно (адрес не существует, бот заблокирован)
+
+
+def backoff(attempts, base=30, cap=3600):
+    # Пауза перед следующей попыткой: 30 с, 1 мин, 2 мин, ... не больше часа, с разбросом, чтобы повторы не шли волной
+    return min(cap, base * 2 ** (attempts - 1)) * (1 + random.random() / 2)
+
+
+class EmailSender:
+    # Одно SMTP-соединение на всю пачку писем
+    def __init__(self, host, port, sender, username=None, password=None, use_tls=False, timeout=30):
+        self.host = host
+        self.port = port
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self._smtp = None
+
+    def send(self, recipient, payload):
+        message = EmailMessage()
+        message['From'] = self.sender
+        message['To'] = recipient
+        message['Subject'] = payload['subject']
+        message.set_content(payload['text'])
+        try:
+            self._connection().send_message(message)
+        except smtplib.SMTPRecipientsRefused as e:
+            raise DeliveryError(f'Адрес отклонён: {e}', permanent=True)
+        except (smtplib.SMTPException, OSError) as e:
+            self.close()
+            raise DeliveryError(f'Ошибка SMTP: {e}')
+
+    def _connection(self):
+        if self._smtp is None:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.use_tls:
+                smtp.starttls()
+            if self.username:
+                smtp.login(self.username, self.password)
+            self._smtp = smtp
+        return self._smtp
+
+    def close(self):
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._smtp = None
+
+
+class TelegramSender:
+    # sendMessage через Bot API; api_server - свой сервер Bot API (или заглушка для тестов)
+    def __init__(self, token, api_server=None, timeout=30):
+        self.url = f"{(api_server or 'https://api.telegram.org').rstrip('/')}/bot{token}/sendMessage"
+        self.timeout = timeout
+
+    def send(self, recipient, payload):
+        body = json.dumps({'chat_id': int(recipient), **payload}).encode('utf-8')
+        req = urllib.request.Request(self.url, data=body, headers={'Content-Type': 'application/json'}, method='POST')
+        try:
+            with urllib.request.urlopen(req, timeout=self.timeout) as response:
+                response.read()
+        except HTTPError as e:
+            try:
+                error = json.loads(e.read())
+            except ValueError:
+                error = {}
+            description = error.get('description', str(e))
+            if e.code == 429:
+                raise DeliveryError(description, retry_after=error.get('parameters', {}).get('retry_after'))
+            # 400 - чат не найден, 403 - бот заблокирован пользователем
+            raise DeliveryError(description, permanent=e.code in (400, 403))
+        except (URLError, OSError) as e:
+            raise DeliveryError(f'Bot API недоступен: {e}')
+
+    def close(self):
+        pass
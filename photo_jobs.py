@@ -0,0 +1,78 @@
+from concurrent.futures import BrokenExecutor, ProcessPoolExecutor, ThreadPoolExecutor
+import multiprocessing
+import os
+import threading
+
+from blob_store import BlobStore
+from images import process_image
+
+
+# Обработка фото в отдельных процессах, чтобы тяжёлая работа Pillow не занимала потоки,
+# обслуживающие запросы. Очередью служит сама таблица photo (статус pending),
+# поэтому задачи переживают перезапуск, а внешний брокер не нужен.
+
+def process_photo_blob(root, digest, max_side, thumb_side, quality):
+    # Выполняется в дочернем процессе: читает исходник из хранилища и кладёт туда результат
+    store = BlobStore(root)
+    with store.open(digest) as f:
+        image = process_image(f, max_side=max_side, thumb_side=thumb_side, quality=quality)
+    sha256, size = store.put(image.data)
+    thumb_sha256, thumb_size = store.put(image.thumb)
+    return {
+        'sha256': sha256,
+        'size': size,
+        'thumb_sha256': thumb_sha256,
+        'thumb_size': thumb_size,
+        'mimetype': image.mimetype,
+        'extension': image.extension,
+    }
+
+
+class WorkerPool:
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._slots = threading.BoundedSemaphore(max(max_workers, 1))
+        self._lock = threading.Lock()
+        self._executor = None
+        self._finisher = None
+        self._pid = None
+
+    def reserve(self):
+        # Не ждём: если все процессы заняты, задача остаётся в очереди в базе
+        return self._slots.acquire(blocking=False)
+
+    def release(self):
+        self._slots.release()
+
+    def submit(self, fn, *args, callback):
+        # Вызывается только после успешного reserve(); если задачу не удалось отправить
+        # (например, BrokenProcessPool после падения процесса), слот возвращается сразу
+        try:
+            executor, finisher = self._get_executors()
+            future = executor.submit(fn, *args)
+        except BaseException as e:
+            self._slots.release()
+            if isinstance(e, BrokenExecutor):
+                with self._lock:
+                    self._executor = None  # Следующая задача создаст пул заново
+            raise
+
+        def done(f):
+            self._slots.release()
+            # Запись результата в базу идёт в одном отдельном потоке, а не в служебном потоке пула
+            finisher.submit(callback, f)
+
+        future.add_done_callback(done)
+        return future
+
+    def _get_executors(self):
+        # Пул создаётся лениво и заново после fork (каждый воркер gunicorn получает свой)
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+                self._finisher = ThreadPoolExecutor(max_workers=1)
+                self._pid = os.getpid()
+            return self._executor, self._finisher
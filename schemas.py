@@ -0,0 +1,96 @@
+from typing import Annotated
+
+import msgspec
+
+
+# Схемы разделов анкеты. По ним и HTML-формы, и JSON API за один проход приводят типы (класс - число)
+# и проверяют поля; правила те же, что у проверки в браузере (скрипты в шаблонах разделов).
+# msgspec собирает проверку для каждой схемы один раз, при первом использовании.
+
+Text = Annotated[str, msgspec.Meta(min_length=1, max_length=255)]
+Email = Annotated[str, msgspec.Meta(max_length=255, pattern=r'^[^\s@]+@[^\s@]+\.[^\s@]+$')]
+Phone = Annotated[str, msgspec.Meta(pattern=r'^\+?\d{10,15}$')]
+SchoolClass = Annotated[int, msgspec.Meta(ge=1, le=11)]
+
+EMPTY_MESSAGE = 'Поле обязательно к заполнению'
+ERROR_MESSAGES = {
+    Text: 'Слишком длинное значение',
+    Email: 'Введите корректный e-mail',
+    Phone: 'Введите корректный номер телефона',
+    SchoolClass: 'Класс может быть от 1 до 11',
+}
+
+
+class GeneralInformationForm(msgspec.Struct):
+    comandName: Text
+    schoolName: Text
+    cityName: Text
+
+
+class MentorForm(msgspec.Struct):
+    mName: Text
+    mPost: Text
+    memail: Email
+    mphoneNumber: Phone
+
+
+class CaptainInfoForm(msgspec.Struct):
+    captainName: Text
+    captainClass: SchoolClass
+    cemail: Email
+    cphoneNumber: Phone
+
+
+class Participant1Form(msgspec.Struct):
+    uch1Name: Text
+    uch1Class: SchoolClass
+    uch1email: Email
+    uch1phoneNumber: Phone
+
+
+class Participant2Form(msgspec.Struct):
+    uch2Name: Text
+    uch2Class: SchoolClass
+    uch2email: Email
+    uch2phoneNumber: Phone
+
+
+class Participant3Form(msgspec.Struct):
+    uch3Name: Text
+    uch3Class: SchoolClass
+    uch3email: Email
+    uch3phoneNumber: Phone
+
+
+SECTION_SCHEMAS = {
+    'general_information': GeneralInformationForm,
+    'mentor': MentorForm,
+    'captain_info': CaptainInfoForm,
+    'participant_1': Participant1Form,
+    'participant_2': Participant2Form,
+    'participant_3': Participant3Form,
+}
+OPTIONAL_SECTIONS = {'participant_3'}  # Пустой раздел означает "нет участника"
+
+
+def validate_section(name, data):
+    # data - форма (request.form) или словарь из JSON. Возвращает (значения для записи, ошибки по полям);
+    # для пустого необязательного раздела значения - None
+    schema = SECTION_SCHEMAS[name]
+    data = {field: str(data.get(field) if data.get(field) is not None else '').strip() for field in schema.__struct_fields__}
+    if name in OPTIONAL_SECTIONS and not any(value not in ('', '0') for value in data.values()):
+        return None, {}
+
+    try:
+        return msgspec.structs.asdict(msgspec.convert(data, schema, strict=False)), {}
+    except msgspec.ValidationError:
+        pass
+    # msgspec останавливается на первой ошибке; чтобы показать все, проверяем поля раздела по одному
+    errors = {}
+    for field in msgspec.structs.fields(schema):
+        value = data[field.name]
+        try:
+            msgspec.convert(value, field.type, strict=False)
+        except msgspec.ValidationError:
+            errors[field.name] = ERROR_MESSAGES[field.type] if value else EMPTY_MESSAGE
+    return None, errors
@@ -0,0 +1,26 @@
+// Форма открыта в Telegram: привязываем сессию к пользователю Telegram по подписанным initData,
+// чтобы продолжить регистрацию с любого устройства и получать от бота подтверждение и напоминания
+(function () {
+    const webApp = window.Telegram && window.Telegram.WebApp;
+    if (!webApp || !webApp.initData || sessionStorage.getItem('telegramBound')) {
+        return;
+    }
+    fetch('/api/telegram/session', {
+        method: 'POST',
+        headers: {'Content-Type': 'application/json'},
+        body: JSON.stringify({init_data: webApp.initData}),
+    })
+    .then(response => response.ok ? response.json() : null)
+    .then(data => {
+        if (!data) {
+            return;
+        }
+        sessionStorage.setItem('telegramBound', '1');
+        // Анкета уже начата: со стартовых страниц сразу переходим туда, где пользователь остановился
+        const startPages = ['/', '/index', '/selection'];
+        if (data.redirect && startPages.includes(window.location.pathname)) {
+            window.location.href = data.redirect;
+        }
+    })
+    .catch(error => console.error('Не удалось привязать Telegram', error));
+})();
@@ -0,0 +1,51 @@
+from collections import Counter
+
+
+# Статистика по анкетам: какой вклад одна анкета вносит в счётчики (город, школа, классы участников,
+# шаг, на котором остановился пользователь). Счётчики в базе меняются только на разницу "до" и "после" записи.
+
+# Шаги мастера по порядку: (таблица раздела, страница). Пользователь "остановился" на первом незаполненном
+STAGES = [
+    ('general_information', 'general_information'),
+    ('mentor', 'mentor'),
+    ('captain_info', 'captain_info'),
+    ('participant1', 'participant_1'),
+    ('participant2', 'participant_2'),
+    ('photo', 'photo'),
+]
+COMPLETE_STAGE = 'final_check'  # Все обязательные разделы заполнены
+
+CLASS_COLUMNS = ('captainClass', 'uch1Class', 'uch2Class', 'uch3Class')
+
+
+def registration_stage(snapshot):
+    for table, stage in STAGES:
+        if snapshot[table] is None:
+            return stage
+    return COMPLETE_STAGE
+
+
+def registration_counters(snapshot):
+    # snapshot - словарь со значениями разделов одной анкеты (None, если пользователя нет)
+    counters = Counter()
+    if snapshot is None:
+        return counters
+    counters['stage', registration_stage(snapshot)] += 1
+    if snapshot['cityName']:
+        counters['city', _normalize(snapshot['cityName'])] += 1
+    if snapshot['schoolName']:
+        counters['school', _normalize(snapshot['schoolName'])] += 1
+    for column in CLASS_COLUMNS:
+        if snapshot[column]:
+            counters['class', str(snapshot[column])] += 1
+    return counters
+
+
+def counters_delta(before, after):
+    delta = Counter(after)
+    delta.subtract(before)
+    return {key: count for key, count in sorted(delta.items()) if count}
+
+
+def _normalize(value):
+    return ' '.join(str(value).split())[:255]
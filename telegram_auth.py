@@ -0,0 +1,43 @@
+from urllib.parse import parse_qsl
+import hashlib
+import hmac
+import json
+import time
+
+
+# Проверка initData, которые Telegram передаёт мини-приложению (window.Telegram.WebApp.initData).
+# Строка подписана токеном бота, поэтому по ней можно доверять id пользователя Telegram:
+# https://core.telegram.org/bots/webapps#validating-data-received-via-the-mini-app
+
+class InvalidInitData(ValueError):
+    pass
+
+
+def check_init_data(init_data, bot_token, max_age):
+    # Возвращает пользователя Telegram (словарь с id, first_name, ...); max_age - сколько секунд initData действительны
+    fields = dict(parse_qsl(init_data or '', keep_blank_values=True))
+    received_hash = fields.pop('hash', '')
+    if not received_hash or not hmac.compare_digest(received_hash, _signature(fields, bot_token)):
+        raise InvalidInitData('Подпись initData не совпадает')
+
+    try:
+        auth_date = int(fields.get('auth_date', 0))
+        user = json.loads(fields['user'])
+    except (KeyError, ValueError):
+        raise InvalidInitData('В initData нет пользователя')
+    if time.time() - auth_date > max_age:
+        raise InvalidInitData('initData устарели')
+    if not isinstance(user, dict) or not isinstance(user.get('id'), int):
+        raise InvalidInitData('В initData нет пользователя')
+    return user
+
+
+def sign_init_data(fields, bot_token):
+    # Обратная операция - для тестов бота и мини-приложения без настоящего Telegram
+    return {**fields, 'hash': _signature(fields, bot_token)}
+
+
+def _signature(fields, bot_token):
+    data_check_string = '\n'.join(f'{key}={value}' for key, value in sorted(fields.items()))
+    secret_key = hmac.new(b'WebAppData', bot_token.encode(), hashlib.sha256).digest()
+    return hmac.new(secret_key, data_check_string.encode(), hashlib.sha256).hexdigest()
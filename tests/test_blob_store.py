@@ -0,0 +1,42 @@
+import os
+import time
+
+from blob_store import BlobStore
+
+
+def age(path, seconds):
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+def test_sweep_unused(tmp_path):
+    store = BlobStore(str(tmp_path))
+    used, _ = store.put(b'used')
+    unused, _ = store.put(b'unused')
+    fresh, _ = store.put(b'fresh')
+    for digest in (used, unused):
+        age(store.path(digest), 7200)
+
+    # Временные файлы прерванных загрузок: старый удаляется, идущая сейчас загрузка остаётся
+    stale_upload = tmp_path / '.upload-stale'
+    stale_upload.write_bytes(b'part')
+    age(stale_upload, 7200)
+    active_upload = tmp_path / '.upload-active'
+    active_upload.write_bytes(b'part')
+
+    assert store.sweep_unused(lambda digests: {used} & set(digests), 3600) == 2
+    assert store.exists(used) and store.exists(fresh)
+    assert not store.exists(unused)
+    assert not stale_upload.exists() and active_upload.exists()
+
+
+def test_put_refreshes_deduplicated_blob(tmp_path):
+    # Повторная загрузка того же содержимого продлевает жизнь файлу, на который ещё нет ссылки в базе
+    store = BlobStore(str(tmp_path))
+    digest, _ = store.put(b'photo')
+    age(store.path(digest), 7200)
+    assert store.put(b'photo')[0] == digest
+
+    assert store.sweep_unused(lambda digests: set(), 3600) == 0
+    assert store.exists(digest)
+    assert [name for name in os.listdir(tmp_path) if name.startswith('.upload-')] == []
@@ -0,0 +1,131 @@
+import json
+import sqlite3
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+import app as form_app
+from app import (
+    COMPLETION_BITS, SERVER_DB_ENGINE_OPTIONS, GeneralInformation, Mentor, Participant3, SectionDraft, User, db,
+    is_busy_error, run_with_retry
+)
+from benchmark import clients
+from benchmark.wizard import ERROR_MARKER, make_photo, registration_steps
+
+
+def register(app, n=1, steps=None):
+    # Проходит мастер регистрации тестовым клиентом; steps - сколько первых шагов пройти
+    client = clients.TestClient(app)
+    for route, method, path, data, upload, expected in registration_steps(n, make_photo(64, 48))[:steps]:
+        status, body = client.request(method, path, data, upload)
+        assert status == expected, (route, body[:300])
+        assert ERROR_MARKER not in body, (route, body[:300])
+    return client
+
+
+def test_wizard_submit(app):
+    register(app)
+
+    with app.app_context():
+        user = db.session.scalars(db.select(User)).one()
+        assert user.completed == sum(bit for name, bit in COMPLETION_BITS.items() if name != 'participant_3')
+        assert db.session.scalars(db.select(GeneralInformation.cityName)).all() == ['Гродно']
+        assert db.session.scalars(db.select(Participant3)).all() == []
+
+
+def test_upserts_update_existing_rows(app):
+    # Повторная отправка раздела и черновика обновляет строку (ON CONFLICT / ON DUPLICATE KEY), а не добавляет
+    client = register(app, steps=3)
+    mentor = dict(mName='Другой ментор', mPost='Учитель', memail='other@example.com', mphoneNumber='+375290000000')
+    assert client.request('POST', '/mentor', mentor)[0] == 302
+    for name in ('Первый', 'Второй'):
+        response = client.client.put('/api/registration/captain_info', json={'captainName': name})
+        assert response.status_code == 200
+
+    with app.app_context():
+        assert db.session.scalars(db.select(Mentor.mName)).all() == ['Другой ментор']
+        drafts = db.session.scalars(db.select(SectionDraft)).all()
+        assert [(draft.section, json.loads(draft.data)) for draft in drafts] == [('captain_info', {'captainName': 'Второй'})]
+
+
+def test_engine_pool_options(app, database_url):
+    with app.app_context():
+        pool = db.engine.pool
+        assert db.session.execute(db.text('SELECT 1')).scalar() == 1
+        if database_url.startswith('sqlite'):
+            assert not app.config['SQLALCHEMY_ENGINE_OPTIONS']
+            return
+        assert app.config['SQLALCHEMY_ENGINE_OPTIONS'] == SERVER_DB_ENGINE_OPTIONS
+        assert pool.size() == SERVER_DB_ENGINE_OPTIONS['pool_size']
+        assert pool._max_overflow == SERVER_DB_ENGINE_OPTIONS['max_overflow']
+        assert pool._timeout == SERVER_DB_ENGINE_OPTIONS['pool_timeout']
+        assert pool._pre_ping is SERVER_DB_ENGINE_OPTIONS['pool_pre_ping']
+        assert pool._recycle == SERVER_DB_ENGINE_OPTIONS['pool_recycle']
+
+
+class DriverError(Exception):
+    # Исключение драйвера: у pymysql код ошибки - первый аргумент, у psycopg2 - атрибут pgcode
+    def __init__(self, *args, pgcode=None):
+        super().__init__(*args)
+        self.pgcode = pgcode
+
+
+@pytest.mark.parametrize('orig, busy', [
+    (sqlite3.OperationalError('database is locked'), True),
+    (sqlite3.OperationalError('database is busy'), True),
+    (sqlite3.OperationalError('no such table: user'), False),
+    (DriverError(1205, 'Lock wait timeout exceeded; try restarting transaction'), True),
+    (DriverError(1213, 'Deadlock found when trying to get lock; try restarting transaction'), True),
+    (DriverError(2006, 'MySQL server has gone away'), False),
+    (DriverError('could not serialize access due to concurrent update', pgcode='40001'), True),
+    (DriverError('deadlock detected', pgcode='40P01'), True),
+    (DriverError('relation "user" does not exist', pgcode='42P01'), False),
+])
+def test_is_busy_error(orig, busy):
+    assert is_busy_error(OperationalError('UPDATE user', {}, orig)) is busy
+
+
+def test_run_with_retry_repeats_busy_transaction(app):
+    attempts = []
+
+    def work():
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OperationalError('UPDATE user', {}, DriverError(1213, 'Deadlock found'))
+        return 'done'
+
+    with app.app_context():
+        assert run_with_retry(work) == 'done'
+    assert len(attempts) == 2
+
+
+def test_run_with_retry_raises_other_errors(app):
+    attempts = []
+
+    def work():
+        attempts.append(1)
+        raise OperationalError('UPDATE user', {}, DriverError(2006, 'MySQL server has gone away'))
+
+    with app.app_context(), pytest.raises(OperationalError):
+        run_with_retry(work)
+    assert len(attempts) == 1
+
+
+def test_final_check_retries_busy_database(app, monkeypatch):
+    steps = registration_steps(1, make_photo(64, 48))
+    client = register(app, steps=-2)
+    write_sections = form_app.write_sections
+    attempts = []
+
+    def busy_once(*args):
+        attempts.append(1)
+        if len(attempts) == 1:
+            raise OperationalError('INSERT INTO mentor', {}, sqlite3.OperationalError('database is locked'))
+        return write_sections(*args)
+
+    monkeypatch.setattr(form_app, 'write_sections', busy_once)
+    _, method, path, data, _, _ = steps[-2]
+    status, body = client.request(method, path, data)
+    assert (status, len(attempts)) == (302, 2), body[:300]
+    with app.app_context():
+        assert db.session.scalars(db.select(User.confirmation_sent_at)).one() is not None
@@ -0,0 +1,240 @@
+from datetime import datetime, timedelta
+from email import message_from_bytes
+from email.policy import default as default_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import socket
+import socketserver
+import threading
+
+import pytest
+
+from app import OutboxMessage, db, dispatch_outbox, enqueue_message, record_outbox_results, run_with_retry
+from outbox import DeliveryError, backoff
+
+
+BOT_TOKEN = '123456:test-token'
+
+
+# Заглушки почтового сервера и Bot API на локальных портах
+
+class SMTPHandler(socketserver.StreamRequestHandler):
+    # Минимальный SMTP: принимает письма, адреса из refused отклоняет кодом 550
+    def handle(self):
+        self.reply('220 stub')
+        while line := self.rfile.readline():
+            command = line.decode().strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb == 'RCPT':
+                address = command.split(':', 1)[1].strip('<> ')
+                self.reply('550 No such user' if address in self.server.refused else '250 OK')
+            elif verb == 'DATA':
+                self.reply('354 End data with <CR><LF>.<CR><LF>')
+                data = b''.join(iter(self.rfile.readline, b'.\r\n'))
+                self.server.messages.append(message_from_bytes(data, policy=default_policy))
+                self.reply('250 OK')
+            elif verb == 'QUIT':
+                self.reply('221 Bye')
+                return
+            else:
+                self.reply('250 OK')
+
+    def reply(self, text):
+        self.wfile.write(f'{text}\r\n'.encode())
+
+
+class BotAPIHandler(BaseHTTPRequestHandler):
+    # sendMessage: ответ для chat_id берётся из server.responses, по умолчанию - успех
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.server.requests.append((self.path, body))
+        status, answer = self.server.responses.get(body['chat_id'], (200, {'ok': True, 'result': {}}))
+        data = json.dumps(answer).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(server):
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+
+@pytest.fixture
+def smtp_server():
+    server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SMTPHandler)
+    server.daemon_threads = True
+    server.messages, server.refused = [], set()
+    yield serve(server)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def bot_api():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), BotAPIHandler)
+    server.requests, server.responses = [], {}
+    yield serve(server)
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def outbox_app(app, smtp_server, bot_api):
+    app.config.update(
+        MAIL_SERVER='127.0.0.1', MAIL_PORT=smtp_server.server_address[1], MAIL_SENDER='noreply@example.com',
+        TELEGRAM_BOT_TOKEN=BOT_TOKEN, TELEGRAM_API_SERVER=f'http://127.0.0.1:{bot_api.server_address[1]}',
+        TELEGRAM_MESSAGES_PER_SECOND=1000,
+    )
+    with app.app_context():
+        yield app
+
+
+def enqueue(*messages):
+    # messages: (канал, получатель); возвращает id сообщений в том же порядке
+    for channel, recipient in messages:
+        if channel == 'email':
+            enqueue_message(channel, recipient, subject='Регистрация команды', text='Спасибо!')
+        else:
+            enqueue_message(channel, recipient, text='Спасибо!')
+    db.session.commit()
+    return db.session.scalars(db.select(OutboxMessage.id).order_by(OutboxMessage.id)).all()
+
+
+def outbox(message_id):
+    db.session.expire_all()
+    return db.session.get(OutboxMessage, message_id)
+
+
+def seconds_until(moment):
+    return (moment - datetime.utcnow()).total_seconds()
+
+
+def test_backoff_grows_and_is_capped():
+    for attempts in range(1, 12):
+        delay = backoff(attempts)
+        expected = min(3600, 30 * 2 ** (attempts - 1))
+        assert expected <= delay <= expected * 1.5
+
+
+def test_record_outbox_results(outbox_app):
+    sent, transient, slow_down, permanent, exhausted = enqueue(*[('email', 'a@example.com')] * 5)
+    max_attempts = outbox_app.config['OUTBOX_MAX_ATTEMPTS']
+    OutboxMessage.query.filter_by(id=exhausted).update({'attempts': max_attempts - 1})
+    db.session.commit()
+
+    run_with_retry(record_outbox_results, [
+        (sent, 0, None),
+        (transient, 2, DeliveryError('Ошибка SMTP: timed out')),
+        (slow_down, 0, DeliveryError('Too Many Requests', retry_after=600)),
+        (permanent, 0, DeliveryError('Адрес отклонён', permanent=True)),
+        (exhausted, max_attempts - 1, DeliveryError('Ошибка SMTP: timed out')),
+    ])
+
+    message = outbox(sent)
+    assert (message.status, message.attempts, message.claim) == ('sent', 1, None)
+    assert message.sent_at is not None
+
+    message = outbox(transient)
+    assert (message.status, message.attempts, message.last_error) == ('pending', 3, 'Ошибка SMTP: timed out')
+    assert 120 - 1 <= seconds_until(message.available_at) <= 180
+
+    # retry_after больше паузы по умолчанию - ждём столько, сколько попросил получатель
+    message = outbox(slow_down)
+    assert (message.status, message.attempts) == ('pending', 1)
+    assert 600 - 1 <= seconds_until(message.available_at) <= 600
+
+    assert (outbox(permanent).status, outbox(permanent).attempts) == ('failed', 1)
+    assert (outbox(exhausted).status, outbox(exhausted).attempts) == ('failed', max_attempts)
+
+
+def test_dispatch_outbox_delivers_and_fails_permanently(outbox_app, smtp_server, bot_api):
+    smtp_server.refused.add('missing@example.com')
+    bot_api.responses[3] = (403, {'ok': False, 'error_code': 403, 'description': 'Forbidden: bot was blocked by the user'})
+    email, refused, telegram, blocked = enqueue(
+        ('email', 'captain@example.com'), ('email', 'missing@example.com'), ('telegram', 1), ('telegram', 3)
+    )
+
+    assert dispatch_outbox() == 4
+    assert dispatch_outbox() == 0
+
+    assert [(message['To'], message['Subject']) for message in smtp_server.messages] == [
+        ('captain@example.com', 'Регистрация команды')
+    ]
+    assert [(path, body['chat_id']) for path, body in bot_api.requests] == [
+        (f'/bot{BOT_TOKEN}/sendMessage', 1), (f'/bot{BOT_TOKEN}/sendMessage', 3)
+    ]
+    assert outbox(email).status == 'sent' and outbox(telegram).status == 'sent'
+    assert outbox(refused).status == 'failed' and 'Адрес отклонён' in outbox(refused).last_error
+    assert outbox(blocked).status == 'failed' and 'blocked' in outbox(blocked).last_error
+
+
+def test_dispatch_outbox_records_broken_messages(outbox_app, smtp_server, bot_api):
+    # Сообщение, на котором отправитель падает не с DeliveryError, не мешает остальным в пачке
+    broken, email = enqueue(('telegram', 'not-a-chat-id'), ('email', 'captain@example.com'))
+    enqueue_message('email', 'mentor@example.com', text='Без темы')
+    db.session.commit()
+    no_subject = db.session.scalars(db.select(OutboxMessage.id).order_by(OutboxMessage.id.desc())).first()
+
+    assert dispatch_outbox() == 3
+    assert dispatch_outbox() == 0
+
+    assert outbox(email).status == 'sent'
+    for message_id, error in ((broken, 'ValueError'), (no_subject, 'KeyError')):
+        message = outbox(message_id)
+        assert (message.status, message.attempts, message.claim) == ('failed', 1, None)
+        assert message.last_error.startswith(error)
+
+
+def test_dispatch_outbox_retries_when_smtp_is_down(outbox_app):
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        outbox_app.config['MAIL_PORT'] = s.getsockname()[1]  # Порт, на котором никто не слушает
+    message_id, = enqueue(('email', 'captain@example.com'))
+
+    assert dispatch_outbox() == 1
+    message = outbox(message_id)
+    assert (message.status, message.attempts, message.claim) == ('pending', 1, None)
+    assert message.last_error.startswith('Ошибка SMTP')
+    assert 30 - 1 <= seconds_until(message.available_at) <= 45
+    assert dispatch_outbox() == 0  # Следующая попытка - только после паузы
+
+
+def test_dispatch_outbox_stops_telegram_after_429(outbox_app, smtp_server, bot_api):
+    bot_api.responses[2] = (429, {
+        'ok': False, 'error_code': 429, 'description': 'Too Many Requests: retry after 120',
+        'parameters': {'retry_after': 120},
+    })
+    first, limited, later, last, email = enqueue(
+        ('telegram', 1), ('telegram', 2), ('telegram', 3), ('telegram', 4), ('email', 'captain@example.com')
+    )
+
+    assert dispatch_outbox() == 5
+
+    # После 429 в эту пачку Telegram больше не отправляется ничего, почта - отправляется
+    assert [body['chat_id'] for _, body in bot_api.requests] == [1, 2]
+    assert len(smtp_server.messages) == 1 and outbox(email).status == 'sent'
+    assert outbox(first).status == 'sent'
+    message = outbox(limited)
+    assert (message.status, message.attempts) == ('pending', 1)
+    assert 120 - 1 <= seconds_until(message.available_at) <= 120
+    for message_id in (later, last):
+        message = outbox(message_id)
+        assert (message.status, message.attempts, message.claim, message.last_error) == ('pending', 0, None, None)
+        assert 120 - 1 <= seconds_until(message.available_at) <= 120
+
+    # Когда пауза прошла, отложенные сообщения уходят
+    OutboxMessage.query.filter(OutboxMessage.status == 'pending').update(
+        {'available_at': datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db.session.commit()
+    bot_api.responses.clear()
+    assert dispatch_outbox() == 3
+    assert [body['chat_id'] for _, body in bot_api.requests] == [1, 2, 2, 3, 4]
+    assert all(outbox(message_id).status == 'sent' for message_id in (limited, later, last))
@@ -0,0 +1,33 @@
+from concurrent.futures.process import BrokenProcessPool
+import os
+
+import pytest
+
+from photo_jobs import WorkerPool
+
+
+class BrokenPool:
+    def submit(self, fn, *args):
+        raise BrokenProcessPool('A child process terminated abruptly')
+
+
+def test_submit_failure_returns_slot():
+    pool = WorkerPool(2)
+    pool._executor, pool._finisher, pool._pid = BrokenPool(), None, os.getpid()
+
+    for _ in range(3):
+        assert pool.reserve()
+        with pytest.raises(BrokenProcessPool):
+            pool.submit(print, callback=print)
+        pool._executor = BrokenPool()
+    assert pool.reserve() and pool.reserve()
+    assert not pool.reserve()
+
+
+def test_broken_pool_is_recreated():
+    pool = WorkerPool(1)
+    pool._executor, pool._finisher, pool._pid = BrokenPool(), None, os.getpid()
+    assert pool.reserve()
+    with pytest.raises(BrokenProcessPool):
+        pool.submit(print, callback=print)
+    assert pool._executor is None
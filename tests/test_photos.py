@@ -0,0 +1,30 @@
+from app import Photo, db
+from benchmark import clients
+from benchmark.wizard import make_photo
+
+
+def upload_photo(app, filename):
+    # Новый пользователь с одним фото; возвращает тестовый клиент и id фото
+    client = clients.TestClient(app)
+    client.request('GET', '/create_user')
+    general = dict(comandName='Команда', schoolName='Школа', cityName='Минск')
+    assert client.request('POST', '/general_information', general)[0] == 302
+    assert client.request('POST', '/photo', {}, ('file', filename, make_photo(64, 48)))[0] == 302
+    with app.app_context():
+        photo_id = db.session.scalars(db.select(Photo.id).order_by(Photo.id.desc())).first()
+    return client, photo_id
+
+
+def test_photo_is_served_only_to_its_owner(app):
+    # Одинаковое имя файла у двух команд: каждая видит только своё фото
+    first, first_photo = upload_photo(app, 'team.jpg')
+    second, second_photo = upload_photo(app, 'team.jpg')
+
+    assert first.client.get(f'/photo/{first_photo}?size=thumb').status_code == 200
+    assert second.client.get(f'/photo/{second_photo}').status_code == 200
+    assert second.client.get(f'/photo/{first_photo}').status_code == 404
+    assert app.test_client().get(f'/photo/{first_photo}').status_code == 404
+    assert first.client.get('/photo/team.webp').status_code == 404
+
+    page = first.client.get('/photo').get_data(as_text=True)
+    assert f'/photo/{first_photo}?v=' in page
@@ -0,0 +1,130 @@
+from datetime import datetime, timedelta
+import json
+import time
+
+import pytest
+
+from app import GeneralInformation, OutboxMessage, User, db
+from bot import store
+from bot.notifications import reminder_message
+from telegram_auth import InvalidInitData, check_init_data, sign_init_data
+
+
+BOT_TOKEN = '123456:test-token'
+MAX_AGE = 3600
+
+
+def init_data(fields, bot_token=BOT_TOKEN, **changes):
+    # Строка initData, как её передаёт window.Telegram.WebApp; changes подменяют поля уже после подписи
+    signed = {**sign_init_data(fields, bot_token), **changes}
+    return '&'.join(f'{key}={value}' for key, value in signed.items())
+
+
+def user_fields(user=None, auth_date=None):
+    return {
+        'auth_date': str(int(auth_date if auth_date is not None else time.time())),
+        'query_id': 'AAH',
+        'user': json.dumps(user if user is not None else {'id': 42, 'first_name': 'Аня'}, ensure_ascii=False),
+    }
+
+
+def test_check_init_data_returns_user():
+    assert check_init_data(init_data(user_fields()), BOT_TOKEN, MAX_AGE) == {'id': 42, 'first_name': 'Аня'}
+
+
+@pytest.mark.parametrize('data', [
+    None,
+    '',
+    init_data(user_fields(), hash=''),
+    init_data(user_fields(), bot_token='654321:other-token'),
+    init_data(user_fields(), user=json.dumps({'id': 43})),
+    '&'.join(f'{key}={value}' for key, value in user_fields().items()),
+])
+def test_check_init_data_rejects_bad_signature(data):
+    with pytest.raises(InvalidInitData, match='Подпись'):
+        check_init_data(data, BOT_TOKEN, MAX_AGE)
+
+
+def test_check_init_data_rejects_expired():
+    data = init_data(user_fields(auth_date=time.time() - MAX_AGE - 60))
+    with pytest.raises(InvalidInitData, match='устарели'):
+        check_init_data(data, BOT_TOKEN, MAX_AGE)
+
+
+@pytest.mark.parametrize('fields', [
+    {'auth_date': str(int(time.time()))},
+    {**user_fields(), 'user': 'not json'},
+    user_fields(user=[42]),
+    user_fields(user={'first_name': 'Аня'}),
+    user_fields(user={'id': '42'}),
+    {**user_fields(), 'auth_date': 'yesterday'},
+])
+def test_check_init_data_rejects_malformed_user(fields):
+    with pytest.raises(InvalidInitData, match='нет пользователя'):
+        check_init_data(init_data(fields), BOT_TOKEN, MAX_AGE)
+
+
+def test_telegram_session_binds_started_registration(app):
+    app.config['TELEGRAM_BOT_TOKEN'] = BOT_TOKEN
+    client = app.test_client()
+    client.get('/create_user')
+    client.post('/general_information', data=dict(comandName='Команда', schoolName='Школа', cityName='Минск'))
+
+    response = client.post('/api/telegram/session', json={'init_data': init_data(user_fields())})
+    assert response.status_code == 200
+    assert response.get_json()['redirect'] == '/mentor'
+    response = client.post('/api/telegram/session', json={'init_data': init_data(user_fields(), bot_token='1:x')})
+    assert response.status_code == 403
+
+    with app.app_context():
+        assert db.session.scalars(db.select(User.telegram_id)).all() == [42]
+
+
+def add_telegram_user(telegram_id, created_ago, **values):
+    user = User(telegram_id=telegram_id, created_at=datetime.utcnow() - created_ago, **values)
+    db.session.add(user)
+    db.session.flush()
+    return user
+
+
+def test_schedule_reminders(app):
+    day = timedelta(days=1)
+    with app.app_context():
+        due = add_telegram_user(1, day)
+        db.session.add(GeneralInformation(user_id=due.id, comandName='Команда', schoolName='Школа', cityName='Минск'))
+        add_telegram_user(2, timedelta(hours=1))  # Слишком рано после начала регистрации
+        add_telegram_user(3, day, confirmation_sent_at=datetime.utcnow())  # Регистрация уже подтверждена
+        add_telegram_user(4, day, reminder_sent_at=datetime.utcnow() - timedelta(hours=1), reminders_sent=1)
+        add_telegram_user(5, day * 10, reminders_sent=app.config['TELEGRAM_MAX_REMINDERS'])
+        db.session.add(User(created_at=datetime.utcnow() - day))  # Без Telegram напоминать некому
+        db.session.commit()
+
+        assert store.schedule_reminders(100, lambda snapshot, stage: reminder_message(app, snapshot, stage)) == 1
+        messages = db.session.scalars(db.select(OutboxMessage)).all()
+        assert [(message.channel, message.recipient) for message in messages] == [('telegram', '1')]
+        assert json.loads(messages[0].payload) == {
+            'text': 'Регистрация команды «Команда» не закончена. Продолжите с шага «Наставник».'
+        }
+        db.session.refresh(due)
+        assert due.reminders_sent == 1 and due.reminder_sent_at is not None
+
+        # Следующее напоминание - не раньше TELEGRAM_REMINDER_INTERVAL
+        assert store.schedule_reminders(100, lambda snapshot, stage: {'text': stage}) == 0
+        due.reminder_sent_at -= app.config['TELEGRAM_REMINDER_INTERVAL']
+        db.session.commit()
+        assert store.schedule_reminders(100, lambda snapshot, stage: {'text': stage}) == 1
+        db.session.refresh(due)
+        assert due.reminders_sent == 2
+
+
+def test_schedule_reminders_respects_limit(app):
+    with app.app_context():
+        for telegram_id in range(1, 6):
+            add_telegram_user(telegram_id, timedelta(days=1))
+        db.session.commit()
+
+        assert store.schedule_reminders(2, lambda snapshot, stage: {'text': stage}) == 2
+        assert store.schedule_reminders(2, lambda snapshot, stage: {'text': stage}) == 2
+        assert store.schedule_reminders(2, lambda snapshot, stage: {'text': stage}) == 1
+        recipients = db.session.scalars(db.select(OutboxMessage.recipient).order_by(OutboxMessage.id)).all()
+        assert recipients == ['1', '2', '3', '4', '5']
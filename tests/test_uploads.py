@@ -0,0 +1,73 @@
+import threading
+
+import pytest
+
+from uploads import ChunkedUploads, OffsetMismatch, UploadError
+
+
+class SlowStream:
+    # Тело запроса, которое отдаёт первую часть и ждёт сигнала, прежде чем закончиться
+    def __init__(self, data, proceed):
+        self.chunks = [data]
+        self.proceed = proceed
+        self.started = threading.Event()
+
+    def read(self, size):
+        if self.chunks:
+            self.started.set()
+            return self.chunks.pop()
+        self.proceed.wait(5)
+        return b''
+
+
+def body(data):
+    proceed = threading.Event()
+    proceed.set()
+    return SlowStream(data, proceed)
+
+
+def test_append_checks_offset(tmp_path):
+    uploads = ChunkedUploads(str(tmp_path))
+    upload_id = uploads.create(1, 'team.jpg', 6)
+
+    assert uploads.append(upload_id, 1, 0, body(b'abc'))['offset'] == 3
+    with pytest.raises(OffsetMismatch) as error:
+        uploads.append(upload_id, 1, 0, body(b'abc'))
+    assert error.value.offset == 3
+    with pytest.raises(UploadError):
+        uploads.append(upload_id, 1, 3, body(b'defg'))
+
+
+def test_concurrent_append_with_same_offset_writes_once(tmp_path):
+    # Повтор запроса приходит, пока оригинал ещё пишет: повтор ждёт и получает OffsetMismatch
+    uploads = ChunkedUploads(str(tmp_path))
+    upload_id = uploads.create(1, 'team.jpg', 10)
+    proceed = threading.Event()
+    results = {}
+
+    stream = SlowStream(b'abcde', proceed)
+
+    def original():
+        results['original'] = uploads.append(upload_id, 1, 0, stream)['offset']
+
+    def retry():
+        try:
+            uploads.append(upload_id, 1, 0, body(b'abcde'))
+            results['retry'] = 'written'
+        except OffsetMismatch as e:
+            results['retry'] = e.offset
+
+    first = threading.Thread(target=original)
+    first.start()
+    assert stream.started.wait(5)
+    second = threading.Thread(target=retry)
+    second.start()
+    second.join(0.2)
+    assert second.is_alive()  # Ждёт блокировку, пока оригинал не закончит
+    proceed.set()
+    first.join()
+    second.join()
+
+    assert results == {'original': 5, 'retry': 5}
+    with uploads.open(upload_id) as f:
+        assert f.read() == b'abcde'
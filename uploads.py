@@ -0,0 +1,129 @@
+from contextlib import contextmanager
+import json
+import os
+import secrets
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+# Незавершённые загрузки по частям: <id>.part - принятые байты, <id>.json - кто и что загружает.
+# Клиент может в любой момент узнать, сколько байт уже принято, и продолжить с этого места.
+
+CHUNK_SIZE = 64 * 1024
+
+
+class UploadError(Exception):
+    pass
+
+
+class UploadNotFound(UploadError):
+    def __init__(self):
+        super().__init__('Загрузка не найдена')
+
+
+class OffsetMismatch(UploadError):
+    def __init__(self, offset):
+        super().__init__(f'Ожидалось смещение {offset}')
+        self.offset = offset
+
+
+class ChunkedUploads:
+    def __init__(self, root):
+        self.root = root
+        self._lock = threading.Lock() if fcntl is None else None
+        os.makedirs(self.root, exist_ok=True)
+
+    def _paths(self, upload_id):
+        if not upload_id.isalnum():
+            raise UploadNotFound()
+        base = os.path.join(self.root, upload_id)
+        return base + '.part', base + '.json'
+
+    def create(self, user_id, filename, size):
+        upload_id = secrets.token_hex(16)
+        part_path, meta_path = self._paths(upload_id)
+        open(part_path, 'wb').close()
+        with open(meta_path, 'w') as f:
+            json.dump({'user_id': user_id, 'filename': filename, 'size': size}, f)
+        return upload_id
+
+    def get(self, upload_id, user_id):
+        part_path, meta_path = self._paths(upload_id)
+        try:
+            with open(meta_path) as f:
+                meta = json.load(f)
+        except FileNotFoundError:
+            raise UploadNotFound()
+        if meta['user_id'] != user_id:
+            raise UploadNotFound()
+        meta['offset'] = os.path.getsize(part_path)
+        return meta
+
+    def append(self, upload_id, user_id, offset, stream):
+        # Дописываем часть; смещение должно совпадать с уже принятым объёмом. Проверка и запись идут под
+        # блокировкой файла части: повтор запроса, пришедший одновременно с оригиналом, дождётся его
+        # и получит OffsetMismatch, а не допишет ту же часть второй раз
+        meta = self.get(upload_id, user_id)
+        part_path, _ = self._paths(upload_id)
+        try:
+            f = open(part_path, 'r+b')
+        except FileNotFoundError:
+            raise UploadNotFound()
+        with f, self._locked(f):
+            received = f.seek(0, os.SEEK_END)
+            if offset != received:
+                raise OffsetMismatch(received)
+            while True:
+                chunk = stream.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                received += len(chunk)
+                if received > meta['size']:
+                    raise UploadError('Получено больше данных, чем заявлено')
+                f.write(chunk)
+        meta['offset'] = received
+        return meta
+
+    @contextmanager
+    def _locked(self, f):
+        # flock снимает система, даже если процесс упал; без fcntl (Windows) блокировка действует в пределах процесса
+        if fcntl is None:
+            with self._lock:
+                try:
+                    yield
+                finally:
+                    f.flush()
+            return
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            f.flush()  # Следующий под блокировкой должен увидеть все записанные байты
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+    def open(self, upload_id):
+        part_path, _ = self._paths(upload_id)
+        return open(part_path, 'rb')
+
+    def delete(self, upload_id):
+        for path in self._paths(upload_id):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def sweep(self, max_age):
+        # Удаляем брошенные загрузки старше max_age секунд
+        now = time.time()
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                if now - os.path.getmtime(path) > max_age:
+                    os.unlink(path)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,6 @@
+from app import create_app
+
+
+# Точка входа для серверов: gunicorn -w 4 wsgi:app или waitress-serve wsgi:app.
+# Перед первым запуском и после обновления кода схему базы обновляет flask --app app db upgrade
+app = create_app()